@@ -0,0 +1,142 @@
+# asset_cache.py
+from collections import OrderedDict
+
+import pygame
+
+from code.settings import BAKED_ASSETS, BAKE_DIR
+from code.baked_assets import BakedStore
+
+
+class AssetCache:
+    """
+    Cache de imagens compartilhado pelo processo inteiro.
+
+    Cada entrada guarda a surface já convertida (convert/convert_alpha) e já
+    escalada, com chave (caminho, tamanho, modo, suave). Modos aceitos:
+      - "alpha":  convert_alpha() (sprites com transparência)
+      - "opaque": convert()       (fundos)
+      - "raw":    sem conversão   (funciona sem display)
+
+    A memória é limitada por max_bytes com remoção LRU. Depois de trocar o modo
+    de vídeo é preciso chamar reload() explicitamente, pois as surfaces
+    convertidas dependem do formato do display.
+
+    Com 'baked' (BakedStore), cada entrada também fica gravada em disco já
+    escalada; nas próximas execuções ela é lida de lá sem decodificar o PNG
+    (ver code/baked_assets.py).
+    """
+
+    MODES = ("alpha", "opaque", "raw")
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, baked=None):
+        self.max_bytes = max_bytes
+        self.baked = baked
+        self._entries = OrderedDict()  # chave -> surface
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.file_loads = 0  # quantas vezes lemos arquivo do disco
+        self.evictions = 0
+
+    def get(self, path, size=None, mode="alpha", smooth=True):
+        """
+        Retorna a surface de 'path' convertida em 'mode' e, se 'size' for dado,
+        escalada para (w, h). Apenas o primeiro pedido de cada chave toca o disco.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"modo inválido: {mode}")
+        size = tuple(size) if size is not None else None
+        key = (path, size, mode, bool(smooth) if size is not None else False)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        baked = self.baked
+        surf = baked.load(*key) if baked is not None else None
+        if surf is None:
+            if size is None:
+                surf = self._load(path, mode)
+            else:
+                surf = self._scaled(path, size, mode, smooth)
+            if baked is not None:
+                baked.save(*key, surf)
+        self._store(key, surf)
+        return surf
+
+    def _scaled(self, path, size, mode, smooth):
+        # a versão sem escala também fica em cache e serve de fonte
+        base_key = (path, None, mode, False)
+        base = self._entries.get(base_key)
+        if base is None:
+            base = self._load(path, mode)
+            self._store(base_key, base)
+        else:
+            self._entries.move_to_end(base_key)
+        if base.get_size() == size:
+            return base
+        if smooth:
+            return pygame.transform.smoothscale(base, size)
+        return pygame.transform.scale(base, size)
+
+    def _load(self, path, mode):
+        self.file_loads += 1
+        surf = pygame.image.load(path)
+        if mode == "alpha":
+            surf = surf.convert_alpha()
+        elif mode == "opaque":
+            surf = surf.convert()
+        return surf
+
+    @staticmethod
+    def _surface_bytes(surf):
+        w, h = surf.get_size()
+        return w * h * surf.get_bytesize()
+
+    def _store(self, key, surf):
+        self._entries[key] = surf
+        self._bytes += self._surface_bytes(surf)
+        # LRU: remove as mais antigas, mas nunca a que acabou de entrar
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old_surf = self._entries.popitem(last=False)
+            if old_key == key:
+                # volta para o fim e para (entrada única maior que o limite)
+                self._entries[old_key] = old_surf
+                break
+            self._bytes -= self._surface_bytes(old_surf)
+            self.evictions += 1
+
+    def reload(self):
+        """
+        Recarrega do disco e reconverte todas as entradas atuais. Deve ser
+        chamado depois de pygame.display.set_mode() mudar o formato da tela.
+        """
+        keys = list(self._entries.keys())
+        self.clear()
+        # carrega primeiro as versões sem escala, usadas como fonte das demais
+        keys.sort(key=lambda k: k[1] is not None)
+        for path, size, mode, smooth in keys:
+            self.get(path, size, mode, smooth)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        stats = {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "file_loads": self.file_loads,
+            "evictions": self.evictions,
+        }
+        if self.baked is not None:
+            stats["baked"] = self.baked.stats()
+        return stats
+
+
+# instância única usada por Target, Game e Menu
+asset_cache = AssetCache(baked=BakedStore(BAKE_DIR) if BAKED_ASSETS else None)
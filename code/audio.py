@@ -0,0 +1,276 @@
+# audio.py
+import math
+import threading
+import time
+from array import array
+from collections import deque
+
+import pygame
+
+from code.settings import AUDIO_FREQUENCY, AUDIO_BUFFER, SFX_CHANNELS, SFX_VOLUME, MUSIC_VOLUME, MUSIC_FADE_MS
+
+MUSIC_CHANNELS = 2  # uma faixa entra enquanto a outra sai (crossfade)
+
+# postado pela thread de decodificação: acorda as telas ociosas para update()
+MUSIC_READY = pygame.event.custom_type()
+
+
+def _tone(freq_start, freq_end, ms, volume, frequency, channels):
+    """
+    Bip sintetizado (16 bits com sinal): frequência deslizando de freq_start
+    a freq_end com decaimento exponencial. Os efeitos não têm arquivo próprio.
+    """
+    n = int(frequency * ms / 1000.0)
+    samples = array("h")
+    phase = 0.0
+    for i in range(n):
+        t = i / n
+        phase += 2.0 * math.pi * (freq_start + (freq_end - freq_start) * t) / frequency
+        value = int(32767 * volume * math.exp(-5.0 * t) * math.sin(phase))
+        samples.extend([value] * channels)
+    return samples.tobytes()
+
+
+class AudioManager:
+    """
+    Mixer, efeitos e músicas do jogo. Uso:
+      audio.play_music(MENU_MUSIC)    # troca de faixa com crossfade
+      audio.pause_music()             # pausa mantendo a posição
+      audio.play_sfx("hit", since)    # since = perf_counter do clique
+      audio.update()                  # a cada iteração dos loops (thread principal)
+
+    O mixer só é aberto no primeiro pedido (não atrasa a abertura do jogo),
+    com buffer pequeno (AUDIO_BUFFER amostras) para reduzir a latência.
+    Os canais 0..SFX_CHANNELS-1 são reservados para efeitos, pré-carregados
+    como Sound; os dois seguintes tocam músicas. Cada música é decodificada
+    uma única vez para um Sound mantido em memória: voltar ao menu retoma
+    ou reinicia a faixa sem ler o mp3 de novo. A decodificação roda numa
+    thread; quando termina, o próximo update() na thread principal começa a
+    faixa, se ela ainda for a pedida e a música não estiver pausada.
+    """
+
+    def __init__(self, frequency=AUDIO_FREQUENCY, buffer=AUDIO_BUFFER, sfx_channels=SFX_CHANNELS):
+        self.frequency = frequency
+        self.buffer = buffer
+        self.sfx_channels = sfx_channels
+        self._ok = None          # False = sem dispositivo de áudio
+        self._ready = False      # canais e efeitos preparados para o mixer atual
+        self._lock = threading.Lock()
+        self._sfx = {}           # nome -> Sound
+        self._next_sfx = 0
+        self._music = {}         # caminho -> Sound já decodificado (None = falhou)
+        self._music_channel = {}  # caminho -> índice do canal
+        self._current = None     # faixa pedida por último
+        self._paused = False     # pause_music() sem play_music() depois
+        self._decoded = None     # faixa pedida que terminou de decodificar (update() começa)
+        self._loading = set()
+        # latência clique -> Channel.play (s), últimas amostras
+        self._latencies = deque(maxlen=512)
+
+    # --- mixer -----------------------------------------------------------
+    def init(self):
+        """
+        Abre o mixer (se preciso) e prepara canais e efeitos. Retorna False
+        se não houver áudio disponível.
+        """
+        if pygame.mixer.get_init():
+            if not self._ready:
+                self._setup()  # mixer aberto por outro código (ex.: pygame.init())
+            return True
+        self._ready = False  # mixer fechado (pygame.quit): Sounds antigos não valem
+        if self._ok is False:
+            return False  # já falhou uma vez: não tenta a cada som
+        try:
+            pygame.mixer.init(self.frequency, -16, 2, self.buffer)
+            self._ok = True
+        except pygame.error:
+            self._ok = False
+            return False
+        self._setup()
+        return True
+
+    def _setup(self):
+        # novo mixer: Sounds antigos (de outra inicialização) não valem mais
+        self._music.clear()
+        self._music_channel.clear()
+        self._current = None
+        pygame.mixer.set_num_channels(self.sfx_channels + MUSIC_CHANNELS)
+        # Sound.play() sem canal explícito não usa os canais do jogo
+        pygame.mixer.set_reserved(self.sfx_channels + MUSIC_CHANNELS)
+        frequency, size, channels = pygame.mixer.get_init()
+        self.frequency = frequency
+        self._ready = True
+        if size != -16:
+            self._sfx = {}
+            return  # formato inesperado: efeitos desligados
+        self._sfx = {
+            "hit": pygame.mixer.Sound(buffer=_tone(1320, 880, 70, 0.5, frequency, channels)),
+            "miss": pygame.mixer.Sound(buffer=_tone(220, 140, 90, 0.4, frequency, channels)),
+        }
+        for sound in self._sfx.values():
+            sound.set_volume(SFX_VOLUME)
+
+    @property
+    def buffer_ms(self):
+        """
+        Latência mínima de saída do buffer do mixer (ms).
+        """
+        return 1000.0 * self.buffer / self.frequency
+
+    # --- efeitos ---------------------------------------------------------
+    def play_sfx(self, name, since=None):
+        """
+        Toca o efeito num canal livre do pool (ou no mais antigo, se todos
+        estiverem ocupados). since: perf_counter do evento que gerou o som,
+        para medir a latência clique -> som.
+        """
+        if not self.init():
+            return
+        sound = self._sfx.get(name)
+        if sound is None:
+            return
+        n = self.sfx_channels
+        start = self._next_sfx
+        channel = None
+        for i in range(n):
+            ch = pygame.mixer.Channel((start + i) % n)
+            if not ch.get_busy():
+                channel = ch
+                self._next_sfx = (start + i + 1) % n
+                break
+        if channel is None:
+            channel = pygame.mixer.Channel(start)
+            self._next_sfx = (start + 1) % n
+        channel.play(sound)
+        if since is not None:
+            self._latencies.append(time.perf_counter() - since)
+
+    def latency_stats(self):
+        """
+        Latência clique -> som em ms: até Channel.play() (software) e estimada
+        até a saída (+ buffer do mixer).
+        """
+        values = sorted(self._latencies)
+        if not values:
+            return {"samples": 0, "buffer_ms": round(self.buffer_ms, 2)}
+        p50 = values[len(values) // 2] * 1000.0
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))] * 1000.0
+        return {
+            "samples": len(values),
+            "play_p50_ms": round(p50, 3),
+            "play_p95_ms": round(p95, 3),
+            "play_max_ms": round(values[-1] * 1000.0, 3),
+            "buffer_ms": round(self.buffer_ms, 2),
+            "output_p50_ms": round(p50 + self.buffer_ms, 2),
+        }
+
+    # --- música ----------------------------------------------------------
+    def preload_music(self, path):
+        """
+        Decodifica a faixa em segundo plano (sem tocar).
+        """
+        if self.init():
+            self._load_music(path)
+
+    def _load_music(self, path):
+        with self._lock:
+            if path in self._music or path in self._loading:
+                return
+            self._loading.add(path)
+            self._music_channel[path] = self.sfx_channels + len(self._music_channel) % MUSIC_CHANNELS
+        threading.Thread(target=self._decode, args=(path,), name="music-decode", daemon=True).start()
+
+    def _decode(self, path):
+        try:
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(MUSIC_VOLUME)
+        except Exception:
+            sound = None  # arquivo ausente ou inválido: música é opcional
+        with self._lock:
+            self._loading.discard(path)
+            self._music[path] = sound
+            if self._current == path and sound is not None:
+                self._decoded = path
+        try:
+            pygame.event.post(pygame.event.Event(MUSIC_READY, path=path))
+        except pygame.error:
+            pass  # sem display: a faixa começa no próximo update()
+
+    def update(self):
+        """
+        Começa a faixa que terminou de decodificar (chamar na thread principal).
+        """
+        if self._decoded is None:
+            return
+        with self._lock:
+            path, self._decoded = self._decoded, None
+            start = path == self._current and not self._paused
+        if start and pygame.mixer.get_init() is not None:
+            self._start(path, restart=True)
+
+    def play_music(self, path, restart=False, fade_ms=MUSIC_FADE_MS):
+        """
+        Passa a tocar 'path' em loop. A faixa anterior sai com fadeout enquanto
+        esta entra com fade-in. Se a faixa estava pausada, continua de onde
+        parou (restart=True começa do início).
+        """
+        if not self.init():
+            return
+        with self._lock:
+            previous, self._current = self._current, path
+            self._paused = False
+            ready = self._music.get(path) is not None
+            if ready:
+                self._decoded = None  # começa aqui mesmo
+        if previous is not None and previous != path:
+            self._fade_out(previous, fade_ms)
+        if ready:
+            self._start(path, restart, fade_ms)
+        else:
+            self._load_music(path)  # começa quando terminar de decodificar
+
+    def _start(self, path, restart=False, fade_ms=MUSIC_FADE_MS):
+        if pygame.mixer.get_init() is None:
+            return
+        channel = pygame.mixer.Channel(self._music_channel[path])
+        sound = self._music[path]
+        if channel.get_sound() is sound and channel.get_busy() and not restart:
+            channel.unpause()  # pausada (ou já tocando): mantém a posição
+            return
+        channel.play(sound, loops=-1, fade_ms=fade_ms)
+
+    def _fade_out(self, path, fade_ms):
+        index = self._music_channel.get(path)
+        if index is None:
+            return
+        channel = pygame.mixer.Channel(index)
+        channel.unpause()
+        channel.fadeout(fade_ms)
+
+    def pause_music(self):
+        """
+        Pausa a faixa atual mantendo a posição (play_music retoma).
+        """
+        self._paused = True  # também vale para uma faixa ainda decodificando
+        if self._current is None or pygame.mixer.get_init() is None:
+            return
+        index = self._music_channel.get(self._current)
+        if index is not None:
+            pygame.mixer.Channel(index).pause()
+
+    def stop_music(self, fade_ms=MUSIC_FADE_MS):
+        if self._current is None or pygame.mixer.get_init() is None:
+            return
+        self._fade_out(self._current, fade_ms)
+        self._current = None
+
+    def stats(self):
+        return {
+            "mixer": pygame.mixer.get_init(),
+            "music_loaded": sorted(p for p, s in self._music.items() if s is not None),
+            "latency": self.latency_stats(),
+        }
+
+
+# instância única usada por Menu e Game
+audio = AudioManager()
@@ -0,0 +1,186 @@
+# baked_assets.py
+"""
+Cache em disco de imagens já decodificadas, convertidas e escaladas.
+
+Cada entrada do AssetCache (caminho, tamanho, modo, suave) vira um arquivo
+em BAKE_DIR com um cabeçalho pequeno seguido dos pixels crus (RGB ou RGBA).
+Na abertura do jogo o arquivo é mapeado com mmap e embrulhado numa surface
+com pygame.image.frombuffer, sem decodificar PNG nem reescalar; a surface
+só é copiada uma vez para o formato do display (convert/convert_alpha).
+
+Bake explícito (opcional, o jogo também grava na primeira vez que carrega):
+  python -m code.baked_assets            # gera/atualiza os arquivos
+  python -m code.baked_assets --clean    # apaga o cache
+"""
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+
+from code.settings import WIDTH, HEIGHT
+
+# cabeçalho (little-endian): magic, versão (u8), largura, altura, WIDTH, HEIGHT (u16),
+# formato dos pixels (4s: b"RGB\0" ou b"RGBA"), mtime (f64) e tamanho (u64) da
+# imagem de origem, sha1 da imagem de origem (20s)
+MAGIC = b"SOLB"
+VERSION = 1
+_HEADER = struct.Struct("<4sBHHHH4sdQ20s")
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+class BakedStore:
+    """
+    Leitura e gravação dos arquivos de pixels. Uma entrada é válida se:
+      - WIDTH/HEIGHT gravados forem os de code/settings.py;
+      - mtime e tamanho da origem forem os gravados, ou, se o mtime mudou
+        (ex.: checkout do git), o sha1 da origem continuar o mesmo.
+    Qualquer outra diferença faz load() retornar None e a imagem é refeita.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def file_for(self, path, size, mode, smooth):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        # o hash do caminho distingue arquivos de mesmo nome em pastas diferentes
+        tag = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+        dims = "orig" if size is None else f"{size[0]}x{size[1]}"
+        name = f"{stem}-{tag}-{dims}-{mode}{'-smooth' if smooth else ''}.px"
+        return os.path.join(self.directory, name)
+
+    def load(self, path, size, mode, smooth):
+        """
+        Surface da entrada no 'mode' pedido, ou None se não houver arquivo válido.
+        """
+        baked_path = self.file_for(path, size, mode, smooth)
+        try:
+            src = os.stat(path)
+            with open(baked_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    surf = self._from_map(mm, path, src, baked_path, mode)
+        except (OSError, ValueError, struct.error, pygame.error):
+            surf = None
+        if surf is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return surf
+
+    def _from_map(self, mm, path, src, baked_path, mode):
+        magic, version, w, h, width, height, fmt, mtime, src_size, digest = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION or (width, height) != (WIDTH, HEIGHT):
+            return None
+        if src_size != src.st_size:
+            return None
+        if mtime != src.st_mtime:
+            if _file_hash(path) != digest:
+                return None
+            # mesmo conteúdo com outro mtime: atualiza o cabeçalho para não refazer o hash
+            self._write_header(baked_path, w, h, fmt, src.st_mtime, src_size, digest)
+        fmt = fmt.rstrip(b"\0").decode()
+        pixels = memoryview(mm)[_HEADER.size:_HEADER.size + w * h * len(fmt)]
+        try:
+            view = pygame.image.frombuffer(pixels, (w, h), fmt)
+            # a cópia para o formato final solta a referência ao mmap
+            if mode == "alpha":
+                surf = view.convert_alpha()
+            elif mode == "opaque":
+                surf = view.convert()
+            else:
+                surf = view.copy()
+            del view
+        finally:
+            pixels.release()
+        return surf
+
+    @staticmethod
+    def _write_header(baked_path, w, h, fmt, mtime, src_size, digest):
+        with open(baked_path, "r+b") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, w, h, WIDTH, HEIGHT, fmt, mtime, src_size, digest))
+
+    def save(self, path, size, mode, smooth, surf):
+        """
+        Grava a surface já pronta. Falhas de escrita são ignoradas (cache opcional).
+        """
+        baked_path = self.file_for(path, size, mode, smooth)
+        fmt = "RGBA" if mode == "alpha" or surf.get_flags() & pygame.SRCALPHA else "RGB"
+        try:
+            src = os.stat(path)
+            digest = _file_hash(path)
+            os.makedirs(self.directory, exist_ok=True)
+            w, h = surf.get_size()
+            header = _HEADER.pack(MAGIC, VERSION, w, h, WIDTH, HEIGHT, fmt.encode().ljust(4, b"\0"),
+                                  src.st_mtime, src.st_size, digest)
+            # grava ao lado e troca: outro processo nunca vê o arquivo pela metade
+            tmp = f"{baked_path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(header)
+                f.write(pygame.image.tobytes(surf, fmt))
+            os.replace(tmp, baked_path)
+            self.writes += 1
+        except (OSError, pygame.error):
+            pass
+
+    def clean(self):
+        """
+        Apaga os arquivos do cache. Retorna quantos foram removidos.
+        """
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for name in names:
+            if name.endswith(".px") or name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+
+def bake():
+    """
+    Gera os arquivos de todas as imagens do jogo na resolução configurada.
+    Precisa de um display (usa o driver dummy do SDL se nenhum for definido).
+    """
+    from code.asset_cache import asset_cache
+    from code.settings import MENU_BG, GAME_BG
+    from code.target import load_sprites
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    asset_cache.get(MENU_BG, (WIDTH, HEIGHT), mode="opaque", smooth=False)
+    asset_cache.get(GAME_BG, (WIDTH, HEIGHT), mode="opaque", smooth=False)
+    load_sprites(screen.get_rect())
+    return asset_cache.baked.stats()
+
+
+if __name__ == "__main__":
+    import sys
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from code.asset_cache import asset_cache
+    if asset_cache.baked is None:
+        print("BAKED_ASSETS está desligado em code/settings.py")
+        sys.exit(1)
+    if "--clean" in sys.argv[1:]:
+        print(f"{asset_cache.baked.clean()} arquivo(s) removido(s) de {asset_cache.baked.directory}")
+    else:
+        stats = bake()
+        print(f"{stats['hits']} válido(s), {stats['writes']} gravado(s) em {asset_cache.baked.directory}")
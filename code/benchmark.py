@@ -0,0 +1,283 @@
+# benchmark.py
+"""
+Benchmarks sem display (SDL_VIDEODRIVER/SDL_AUDIODRIVER=dummy). Uso:
+  python -m code.benchmark                  # mede e compara com o baseline
+  python -m code.benchmark --save           # mede e grava o baseline
+  python -m code.benchmark --quick          # tamanhos menores (sem 1M linhas)
+  python -m code.benchmark --threshold 0.25 --only score
+Sai com código 1 se algum resultado ficar mais de 'threshold' (fração) acima
+do baseline. Baselines dependem da máquina: grave um por máquina de teste.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import code.settings as settings
+from code.settings import BASE_DIR, WIDTH, HEIGHT
+
+BASELINE_FILE = os.path.join(BASE_DIR, "benchmark_baseline.json")
+
+
+def measure(fn, number=1, repeat=7):
+    """
+    Executa fn() 'number' vezes por rodada, 'repeat' rodadas. Retorna o tempo
+    por chamada (s) da melhor rodada: ruído de outros processos só aumenta
+    o tempo, então o mínimo é o valor mais estável entre execuções.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def bench_targets(results, quick):
+    from code.target import Target
+    from code.target_pool import TargetPool
+
+    screen_rect = pygame.display.get_surface().get_rect()
+    results["target_construct"] = measure(lambda: Target(screen_rect), number=1000)
+
+    targets = [Target(screen_rect, active_ms=1e12, warning_ms=1e12) for _ in range(500)]
+
+    def update_all():
+        for t in targets:
+            t.update(1)
+    results["target_update_x500"] = measure(update_all, number=50)
+
+    surface = pygame.display.get_surface()
+
+    def draw_all():
+        for t in targets:
+            t.draw(surface)
+    results["target_draw_x500"] = measure(draw_all, number=20)
+
+    pool = TargetPool(settings.TARGET_SIZE)
+    rng = random.Random(0)
+    for _ in range(500):
+        pool.spawn(rng.randint(20, WIDTH - 140), rng.randint(60, HEIGHT - 160), 1e12, 1e12)
+    results["pool_update_x500"] = measure(lambda: pool.update(1), number=50)
+    results["pool_hit_test_x500"] = measure(lambda: pool.hit_test(WIDTH // 2, HEIGHT // 2), number=200)
+
+
+def bench_game_frame(results, quick, score_manager):
+    from code.game import Game
+    from code.simulation import Simulation, FixedStepper
+
+    screen = pygame.display.get_surface()
+    game = Game(screen, pygame.time.Clock(), score_manager)
+    for n in (10, 100) if quick else (10, 100, 500):
+        sim = Simulation(target_size=game.target_img.get_size(), rng=random.Random(n))
+        sim.state.time_left = 1e9  # partida não termina durante a medição
+        rng = random.Random(n)
+        w, h = sim.target_size
+        for i in range(n):
+            # metade em warning, metade ativa; durações longas para não expirar
+            sim.targets.spawn(rng.randint(20, WIDTH - w - 20), rng.randint(60, HEIGHT - h - 20),
+                              1e12 if i % 2 else 0.0, 1e12)
+        sim.spawn_chance = 0.0  # mantém exatamente n alvos vivos
+        stepper = FixedStepper(sim)
+        game.renderer.set_background(game.bg, (40, 120, 200))
+
+        def frame():
+            stepper.advance(1000.0 / settings.FPS)
+            game._draw_match(sim, sim.state, stepper.alpha, stepper.step_ms)
+        frame()
+        results[f"game_frame_{n}_targets"] = measure(frame, number=30)
+
+    # efeitos de acerto: 10 alvos + partículas vivas (explosões em posições fixas)
+    if game.effects:
+        effects = game.effects
+        for n in (1000,) if quick else (1000, 4000):
+            sim = Simulation(target_size=game.target_img.get_size(), rng=random.Random(n))
+            sim.state.time_left = 1e9
+            sim.spawn_chance = 0.0
+            for i in range(10):
+                sim.targets.spawn(40 + i * 60, 200, 0.0, 1e12)
+            stepper = FixedStepper(sim)
+            game.renderer.set_background(game.bg, (40, 120, 200))
+            rng = random.Random(n)
+            effects.rng = random.Random(n)
+
+            def frame():
+                # repõe as que morreram: mantém ~n partículas vivas
+                while effects.particles.count + effects.per_hit <= n:
+                    effects.hit((rng.randint(100, WIDTH - 100), rng.randint(100, HEIGHT - 100)), "+10")
+                effects.update(1000.0 / settings.FPS)
+                stepper.advance(1000.0 / settings.FPS)
+                game._draw_match(sim, sim.state, stepper.alpha, stepper.step_ms)
+            effects.clear()
+            frame()
+            results[f"game_frame_{n}_particles"] = measure(frame, number=30)
+        effects.clear()
+
+
+def bench_menu(results, quick, score_manager):
+    from code.menu import Menu
+
+    screen = pygame.display.get_surface()
+    menu = Menu(screen, pygame.time.Clock(), score_manager)
+    button = menu.buttons[0]
+    results["button_draw"] = measure(lambda: button.draw(screen), number=500)
+
+    renderer = menu.renderer
+
+    def full_frame():
+        renderer.invalidate()
+        renderer.begin_frame()
+        for b in menu.buttons:
+            b.draw(screen)
+        renderer.present()
+    results["menu_frame_full"] = measure(full_frame, number=50)
+
+    def hover_frame():
+        # um botão muda de hover: só ele é redesenhado e enviado
+        button.hover = not button.hover
+        renderer.begin_frame()
+        renderer.restore(button.rect)
+        button.draw(screen)
+        renderer.present()
+    results["menu_frame_hover"] = measure(hover_frame, number=200)
+
+
+def _populate(db_path, rows, rng):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            points INTEGER NOT NULL,
+            play_time_seconds REAL NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+    chunk = 50000
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        conn.executemany(
+            "INSERT INTO scores (player_name, points, play_time_seconds, created_at) VALUES (?, ?, ?, ?)",
+            ((f"p{rng.randint(0, 999)}", rng.randint(0, 60) * 10, rng.uniform(5, 120), "2025-01-01T00:00:00")
+             for _ in range(n)))
+        conn.commit()
+    conn.close()
+
+
+def bench_scores(results, quick, tmpdir):
+    from code.score_manager import ScoreManager
+
+    sizes = (1000, 100000) if quick else (1000, 100000, 1000000)
+    rng = random.Random(0)
+    for size in sizes:
+        label = f"{size // 1000}k" if size < 1000000 else f"{size // 1000000}m"
+        db_path = os.path.join(tmpdir, f"scores_{label}.db")
+        _populate(db_path, size, rng)
+        manager = ScoreManager(db_path)
+
+        results[f"score_add_enqueue_{label}"] = measure(lambda: manager.add_score("bench", 100, 30.0), number=200)
+        manager.flush()
+
+        def add_and_commit():
+            manager.add_score("bench", rng.randint(0, 600), 30.0)
+            manager.flush()
+        results[f"score_add_commit_{label}"] = measure(add_and_commit, number=20)
+
+        def top_cold():
+            manager._top_keys = None  # força leitura do banco
+            manager.top_scores(10)
+        results[f"score_top10_cold_{label}"] = measure(top_cold, number=20)
+        results[f"score_top10_cached_{label}"] = measure(lambda: manager.top_scores(10), number=200)
+
+        # página profunda por cursor (fora do cache do top N)
+        cursor = (300, 60.0, 0)
+        results[f"score_page_deep_{label}"] = measure(lambda: manager.scores_page(10, cursor), number=50)
+        manager.close()
+
+
+GROUPS = ("targets", "frame", "menu", "score")
+
+
+def run(groups, quick):
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        from code.score_manager import ScoreManager
+        manager = ScoreManager(os.path.join(tmpdir, "ui.db"))
+        try:
+            if "targets" in groups:
+                bench_targets(results, quick)
+            if "frame" in groups:
+                bench_game_frame(results, quick, manager)
+            if "menu" in groups:
+                bench_menu(results, quick, manager)
+            if "score" in groups:
+                bench_scores(results, quick, tmpdir)
+        finally:
+            manager.close()
+            pygame.quit()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Retorna lista de (nome, atual, baseline, razão) acima do limite.
+    """
+    regressions = []
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base:
+            ratio = value / base
+            if ratio > 1.0 + threshold:
+                regressions.append((name, value, base, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do Speed Of Light")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="arquivo JSON de baseline")
+    parser.add_argument("--save", action="store_true", help="grava os resultados como novo baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="regressão tolerada (fração, padrão 0.20)")
+    parser.add_argument("--quick", action="store_true", help="tamanhos menores (sem a tabela de 1M linhas)")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=GROUPS, help="grupos a rodar")
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.quick)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        extra = f"  ({value / base:5.2f}x baseline)" if base else ""
+        print(f"{name:<32} {value * 1e6:12.2f} us{extra}")
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "pygame": pygame.version.ver, "results": baseline},
+                      f, indent=2, sort_keys=True)
+        print(f"baseline gravado em {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, value, base, ratio in regressions:
+        print(f"REGRESSÃO {name}: {value * 1e6:.2f} us vs {base * 1e6:.2f} us ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
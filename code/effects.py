@@ -0,0 +1,188 @@
+# effects.py
+import math
+import random
+
+import pygame
+
+from code.settings import PARTICLE_CAPACITY, PARTICLES_PER_HIT, PARTICLE_LIFE_MS, PARTICLE_SPEED, \
+    PARTICLE_GRAVITY, POPUP_LIFE_MS, FADE_LEVELS
+from code.text_cache import text_cache
+
+
+def fade_frames(surf, levels=FADE_LEVELS):
+    """
+    'levels' cópias de surf com opacidade decrescente (índice 0 = opaca).
+    Pré-renderizadas uma vez: desenhar uma partícula desbotando é só trocar
+    de quadro, sem set_alpha nem cópia por quadro.
+    """
+    frames = []
+    per_pixel = surf.get_flags() & pygame.SRCALPHA
+    for i in range(levels):
+        alpha = int(255 * (1.0 - i / levels))
+        frame = surf.copy()
+        if per_pixel:
+            frame.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            frame.set_alpha(alpha)
+        frames.append(frame)
+    return frames
+
+
+def _dot(radius, color):
+    surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, color, (radius, radius), radius)
+    # no formato da tela o blit não converte pixel a pixel
+    return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+
+class ParticlePool:
+    """
+    Partículas em estrutura de arrays, como o TargetPool: uma lista
+    pré-alocada por campo (posição, velocidade, idade, vida, sprite) e os
+    slots vivos sempre em [0, count). update() move, aplica gravidade, envelhece
+    e compacta as mortas numa única passada sem criar objetos; draw() só
+    acrescenta (surface, posição) à lista do quadro, que vai inteira para um
+    Surface.blits. Capacidade fixa: além dela, novas partículas são descartadas.
+
+    Sprites: add_strip(frames) registra uma sequência de fade_frames e
+    retorna o índice usado em emit(); o quadro desenhado vem da idade.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, gravity=0.0):
+        self.capacity = capacity
+        self.gravity = gravity     # px/ms² somado a vy
+        self.count = 0
+        self.dropped = 0           # emissões descartadas por falta de slot
+        self.x = [0.0] * capacity
+        self.y = [0.0] * capacity
+        self.vx = [0.0] * capacity
+        self.vy = [0.0] * capacity
+        self.age = [0.0] * capacity
+        self.life = [1.0] * capacity
+        self.strip = [0] * capacity
+        self.strips = []           # índice -> lista de quadros (fade)
+        self._offsets = []         # índice -> (meia largura, meia altura)
+
+    def add_strip(self, frames):
+        self.strips.append(frames)
+        w, h = frames[0].get_size()
+        self._offsets.append((w / 2.0, h / 2.0))
+        return len(self.strips) - 1
+
+    def emit(self, x, y, vx, vy, life, strip):
+        i = self.count
+        if i == self.capacity:
+            self.dropped += 1
+            return -1
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.age[i] = 0.0
+        self.life[i] = life
+        self.strip[i] = strip
+        self.count = i + 1
+        return i
+
+    def update(self, dt):
+        """
+        Avança todas as partículas em dt ms e remove as que passaram da vida.
+        """
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        age, life, strip = self.age, self.life, self.strip
+        g = self.gravity * dt
+        w = 0
+        for i in range(self.count):
+            a = age[i] + dt
+            if a >= life[i]:
+                continue
+            v = vy[i] + g
+            x[w] = x[i] + vx[i] * dt
+            y[w] = y[i] + v * dt
+            vx[w] = vx[i]
+            vy[w] = v
+            age[w] = a
+            if w != i:
+                life[w] = life[i]
+                strip[w] = strip[i]
+            w += 1
+        self.count = w
+
+    def draw(self, out):
+        """
+        Acrescenta (surface, (x, y)) de cada partícula viva à lista 'out'.
+        """
+        x, y, age, life, strip = self.x, self.y, self.age, self.life, self.strip
+        strips, offsets = self.strips, self._offsets
+        append = out.append
+        for i in range(self.count):
+            frames = strips[strip[i]]
+            ox, oy = offsets[strip[i]]
+            append((frames[int(age[i] * len(frames) / life[i])], (x[i] - ox, y[i] - oy)))
+
+    def clear(self):
+        self.count = 0
+
+
+class HitEffects:
+    """
+    Efeitos de acerto: explosão de partículas e um "+pontos" que sobe e some.
+    Usa um random próprio: os efeitos não mexem no rng da Simulation (replays
+    continuam determinísticos). Uso por quadro:
+      effects.hit(pos, "+10")   # para cada acerto
+      effects.update(dt)
+      effects.draw(batch)       # depois dos alvos, antes de renderer.blits(batch)
+    """
+
+    COLORS = ((255, 240, 120), (255, 180, 60), (255, 255, 255), (120, 220, 255))
+
+    def __init__(self, font, capacity=PARTICLE_CAPACITY, per_hit=PARTICLES_PER_HIT, rng=None):
+        self.font = font
+        self.per_hit = per_hit
+        self.rng = rng or random.Random()
+        self.particles = ParticlePool(capacity, gravity=PARTICLE_GRAVITY)
+        self.popups = ParticlePool(64)
+        self._dots = [self.particles.add_strip(fade_frames(_dot(r, c)))
+                      for c in self.COLORS for r in (2, 3)]
+        self._popup_strips = {}  # texto -> índice do strip
+
+    @property
+    def count(self):
+        return self.particles.count + self.popups.count
+
+    def hit(self, pos, text=None):
+        rng = self.rng
+        x, y = pos
+        emit = self.particles.emit
+        dots = self._dots
+        for _ in range(self.per_hit):
+            angle = rng.uniform(0.0, 2.0 * math.pi)
+            speed = PARTICLE_SPEED * rng.uniform(0.3, 1.0)
+            life = PARTICLE_LIFE_MS * rng.uniform(0.6, 1.0)
+            if emit(x, y, math.cos(angle) * speed, math.sin(angle) * speed, life, rng.choice(dots)) < 0:
+                break
+        if text:
+            self.popups.emit(x, y - 10, 0.0, -0.04, POPUP_LIFE_MS, self.popup_strip(text))
+
+    def popup_strip(self, text):
+        """
+        Índice dos quadros de fade do texto, renderizados na primeira vez
+        (chame antes da partida para não pagar isso no quadro do acerto).
+        """
+        strip = self._popup_strips.get(text)
+        if strip is None:
+            surf = text_cache.render(self.font, text, True, (255, 255, 160))
+            strip = self._popup_strips[text] = self.popups.add_strip(fade_frames(surf))
+        return strip
+
+    def update(self, dt):
+        self.particles.update(dt)
+        self.popups.update(dt)
+
+    def draw(self, out):
+        self.particles.draw(out)
+        self.popups.draw(out)  # textos por cima das partículas
+
+    def clear(self):
+        self.particles.clear()
+        self.popups.clear()
@@ -0,0 +1,30 @@
+# fonts.py
+import pygame
+
+DEFAULT_FONT = "arial"
+
+_fonts = {}   # (nome, tamanho, bold, italic) -> pygame.font.Font
+
+
+def get_font(size, name=DEFAULT_FONT, bold=False, italic=False):
+    """
+    Fonte compartilhada pelo processo. SysFont procura a fonte no sistema
+    (na primeira chamada, varre as fontes instaladas via fontconfig); aqui
+    cada combinação é criada uma única vez e reaproveitada por todas as
+    telas. Como o objeto é o mesmo, o text_cache também acerta entre telas.
+    """
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(name, size, bold, italic)
+        _fonts[key] = font
+    return font
+
+
+def clear_fonts():
+    """
+    Esquece as fontes criadas (necessário após pygame.quit()/font.quit()).
+    """
+    _fonts.clear()
@@ -1,176 +1,358 @@
 # game.py
-import pygame
+import os
 import random
 import time
-from code.settings import WIDTH, HEIGHT, FPS, INITIAL_TIME, TIME_REWARD, SCORE_PER_HIT, INITIAL_TARGET_ACTIVE_MS, \
-    MIN_ACTIVE_MS, GAME_MUSIC, GAME_BG
-from code.target import Target
-from code.score_manager import ScoreManager
+import pygame
+from code.settings import WIDTH, HEIGHT, FPS, GAME_MUSIC, GAME_BG, PRINT_STATS, RECORD_MATCHES, REPLAY_DIR, \
+    SIM_HZ, MAX_FRAME_MS, RENDER_FPS_CAP, INTERPOLATE, PROFILE_DIR, CLICK_ON_PRESS, HIT_EFFECTS, \
+    TELEMETRY
+from code.simulation import Simulation, FixedStepper
+from code.replay import MatchRecorder
+from code.target import load_sprites
+from code.target_pool import WARNING
+from code.score_manager import get_score_manager
+from code.asset_cache import asset_cache
+from code.renderer import DirtyRenderer
+from code.text_cache import text_cache
+from code.profiler import FrameProfiler
+from code.fonts import get_font
+from code.audio import audio
+from code.idle import IdleWaiter
+from code.input_timing import TimedEvents, ClickLatency
+from code.effects import HitEffects
+from code.telemetry import MatchTelemetry
+
+# fases medidas pelo profiler em cada quadro da partida
+MATCH_PHASES = ("events", "clicks", "spawn", "update", "draw", "text", "present", "db")
+
 
 class Game:
     """
     Classe que gerencia uma partida. Uso:
       g = Game(screen, clock)
       g.run(player_name)
+    score_manager: por padrão o ScoreManager compartilhado do processo.
+    sim_params: argumentos extras da Simulation (ex.: ritmo de spawn no modo soak).
     """
 
-    def __init__(self, screen, clock):
+    def __init__(self, screen, clock, score_manager=None, sim_params=None):
         self.screen = screen
         self.clock = clock
+        self.sim_params = sim_params or {}
         self.screen_rect = self.screen.get_rect()
-        self.score_manager = ScoreManager()
+        self.score_manager = score_manager if score_manager is not None else get_score_manager()
 
-        # surfaces de background são carregadas internamente para simplicidade
+        # background vem do cache compartilhado (carregado uma vez por processo)
         try:
-            self.bg = pygame.image.load(GAME_BG).convert()
-            self.bg = pygame.transform.scale(self.bg, (WIDTH, HEIGHT))
+            self.bg = asset_cache.get(GAME_BG, (WIDTH, HEIGHT), mode="opaque", smooth=False)
         except Exception:
             self.bg = None  # se não existir, pintamos cor sólida
 
-        self.font = pygame.font.SysFont("arial", 22)
-        self.large_font = pygame.font.SysFont("arial", 36)
+        self.target_img, self.shadow_img = load_sprites(self.screen_rect)
 
-    def run(self, player_name):
+        self.font = get_font(22)
+        self.large_font = get_font(36)
+
+        # envia só as áreas que mudaram (alvos e labels)
+        self.renderer = DirtyRenderer(self.screen, self.bg, (40, 120, 200))
+        self.profiler = FrameProfiler(MATCH_PHASES)
+        self.small_font = get_font(14)
+        # partículas e "+pontos" dos acertos; None = sem efeitos
+        self.effects = HitEffects(get_font(24, bold=True)) if HIT_EFFECTS else None
+        self._batch = []  # (surface, posição) do quadro, para um único renderer.blits
+
+    def run(self, player_name, record_path=None):
         """
         Loop principal da partida. Retorna dicionário com resultado.
+        As regras ficam em Simulation, avançada em passos fixos (SIM_HZ) por um
+        FixedStepper; aqui só tratamos eventos e desenho, limitado a
+        RENDER_FPS_CAP quadros por segundo (0 = sem limite).
+        record_path: grava a partida para replay (ver code/replay.py). Com
+        RECORD_MATCHES ligado, grava em REPLAY_DIR mesmo sem record_path.
         """
-        running = True
-        score = 0
-        start_time = time.time()
-        time_left = INITIAL_TIME
-        play_time_elapsed = 0.0
-
-        # spawn control
-        spawn_timer = 0.0
-        spawn_interval = 900  # ms entre tentativas de spawn
-        targets = []
+        # seed própria: a partida é reproduzível a partir dela + dts e cliques
+        seed = random.randrange(2 ** 63)
+        width, height = self.screen_rect.size
+        target_size = self.target_img.get_size()
+        # eventos por alvo (spawn, ativação, clique/expiração), gravados com o score
+        telemetry = MatchTelemetry() if TELEMETRY else None
+        sim = Simulation(width, height, target_size=target_size, rng=random.Random(seed), telemetry=telemetry,
+                         **self.sim_params)
+        state = sim.state
+        prof = self.profiler
+        sim.profiler = prof
+        stepper = FixedStepper(sim, 1000.0 / SIM_HZ, MAX_FRAME_MS)
+        recorder = None
+        if record_path or RECORD_MATCHES:
+            recorder = MatchRecorder(seed, width, height, target_size, stepper.step_ms, self.sim_params)
+            stepper.recorder = recorder
+        self.renderer.set_background(self.bg, (40, 120, 200))
+        effects = self.effects
+        popup = f"+{sim.score_per_hit}"
+        if effects:
+            effects.clear()
+            effects.popup_strip(popup)
 
-        # dynamic difficulty: reduce active_ms conforme acertos
-        target_active_ms = INITIAL_TARGET_ACTIVE_MS
+        # tocar música de jogo (se existir), em crossfade com a do menu
+        audio.play_music(GAME_MUSIC, restart=True)
 
-        # tocar música de jogo (se existir)
-        try:
-            pygame.mixer.music.load(GAME_MUSIC)
-            pygame.mixer.music.play(-1)
-        except Exception:
-            pass
+        # taxas medidas (passos de simulação e quadros desenhados por segundo)
+        self.steps_per_sec = self.frames_per_sec = 0.0
+        frames = 0
+        start = last = rate_t0 = time.perf_counter()
+        rate_steps = rate_frames = 0
+        # espera do quadro recolhendo eventos com horário (ver code/input_timing.py)
+        timed_events = TimedEvents(RENDER_FPS_CAP)
+        click_button = pygame.MOUSEBUTTONDOWN if CLICK_ON_PRESS else pygame.MOUSEBUTTONUP
+        pending_clicks = []  # horários dos cliques ainda não aplicados, em ordem
+        self.click_latency = latency = ClickLatency()
 
+        running = True
         while running:
-            dt = self.clock.tick(FPS)  # ms elapsed since last frame
-            # atualiza timer em segundos
-            time_left -= dt / 1000.0
-            play_time_elapsed = time.time() - start_time
+            events = timed_events.wait_frame()
+            audio.update()  # música do jogo, se ainda decodificava no play_music
+            now = time.perf_counter()
+            dt = (now - last) * 1000.0  # ms elapsed since last frame
+            prof.begin_frame()
 
-            for event in pygame.event.get():
+            clicks = []
+            for t, event in events:
                 if event.type == pygame.QUIT:
                     # salva parcial e fecha (tratamento simples)
                     running = False
                     break
-                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                    pos = event.pos
-                    for t in targets[:]:
-                        if t.handle_click(pos):
-                            # acerto
-                            score += SCORE_PER_HIT
-                            time_left += TIME_REWARD
-                            # reduzir time de exibição do alvo progressivamente
-                            target_active_ms = max(MIN_ACTIVE_MS, target_active_ms - 60)
-                            # remover alvo clicado
-                            try:
-                                targets.remove(t)
-                            except ValueError:
-                                pass
-
-            # spawn logic
-            spawn_timer += dt
-            if spawn_timer >= spawn_interval:
-                spawn_timer = 0
-                # chance de spawn
-                if random.random() < 0.9:  # 90% chance
-                    # cria target com warning_ms e active_ms atual
-                    t = Target(self.screen_rect, active_ms=target_active_ms)
-                    targets.append(t)
-                    # Opcional: reduzir spawn_interval conforme o tempo passa (mais alvos)
-                    spawn_interval = max(350, spawn_interval - 4)
-
-            # update targets
-            for t in targets[:]:
-                t.update(dt)
-                if not t.is_alive():
-                    targets.remove(t)
-
-            # desenhar cena
-            if self.bg:
-                self.screen.blit(self.bg, (0, 0))
-            else:
-                self.screen.fill((40, 120, 200))
-
-            # desenha targets
-            for t in targets:
-                t.draw(self.screen)
-
-            # UI: score e timer
-            score_surf = self.font.render(f"Score: {score}", True, (255, 255, 255))
-            self.screen.blit(score_surf, (10, 10))
-            # timer format mm:ss
-            secs = max(0, int(time_left))
-            timer_surf = self.font.render(f"Tempo: {secs}s", True, (255, 255, 255))
-            self.screen.blit(timer_surf, (WIDTH - 130, 10))
-
-            pygame.display.flip()
-
-            if time_left <= 0:
+                elif event.type == click_button and event.button == 1:
+                    # offset em relação ao advance() anterior: o clique entra no passo daquele instante
+                    clicks.append(((t - last) * 1000.0, event.pos))
+                    pending_clicks.append(t)
+                else:
+                    prof.handle_event(event)
+            if not running:
+                break
+            last = now
+            prof.lap("events")
+
+            steps = stepper.advance(dt, timed_clicks=clicks)
+            applied = pending_clicks[:stepper.frame_clicks]
+            if applied:
+                del pending_clicks[:len(applied)]
+                processed_at = time.perf_counter()
+                # som antes do desenho: a latência clique -> som não inclui o quadro
+                if stepper.frame_hits:
+                    audio.play_sfx("hit", applied[0])
+                if stepper.frame_misses:
+                    audio.play_sfx("miss", applied[0])
+            if effects:
+                for pos in stepper.frame_hits:
+                    effects.hit(pos, popup)
+                effects.update(dt)
+
+            self._draw_match(sim, state, stepper.alpha if INTERPOLATE else 0.0, stepper.step_ms)
+            prof.end_frame()
+            frames += 1
+            if applied:
+                presented_at = time.perf_counter()
+                for t in applied:
+                    latency.add(t, processed_at, presented_at)
+
+            rate_steps += steps
+            rate_frames += 1
+            if now - rate_t0 >= 1.0:
+                self.steps_per_sec = rate_steps / (now - rate_t0)
+                self.frames_per_sec = rate_frames / (now - rate_t0)
+                rate_t0 = now
+                rate_steps = rate_frames = 0
+
+            if state.finished:
                 running = False
+        elapsed = max(time.perf_counter() - start, 1e-9)
 
         # partida acabou: parar música de jogo
-        try:
-            pygame.mixer.music.stop()
-        except Exception:
-            pass
+        audio.stop_music()
+
+        # salvar score no DB (medido como um quadro extra, só com a fase "db")
+        prof.begin_frame()
+        # posição antes de enfileirar: empates já gravados ficam à frente
+        rank = self.score_manager.rank_for(state.score, state.play_time)
+        self.score_manager.add_score(player_name, state.score, state.play_time,
+                                     telemetry=telemetry.pack() if telemetry else None)
+        summary = self.score_manager.player_summary(player_name)
+        prof.lap("db")
+        prof.end_frame()
+        if prof.enabled:
+            try:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                prof.export_csv(os.path.join(PROFILE_DIR, time.strftime("match-%Y%m%d-%H%M%S.csv")))
+            except OSError:
+                pass  # exportar trace é opcional
+
+        if recorder:
+            recorder.finish(stepper.steps)
+            if not record_path:
+                os.makedirs(REPLAY_DIR, exist_ok=True)
+                record_path = os.path.join(REPLAY_DIR, time.strftime("match-%Y%m%d-%H%M%S.solr"))
+            try:
+                recorder.save(record_path)
+            except OSError:
+                pass  # gravar replay é opcional
 
-        # salvar score no DB
-        self.score_manager.add_score(player_name, score, play_time_elapsed)
+        stats = {
+            "steps_per_sec": round(stepper.steps / elapsed, 1),
+            "frames_per_sec": round(frames / elapsed, 1),
+            "dropped_ms": round(stepper.dropped_ms, 1),
+            "render": self.renderer.stats(),
+            "text_cache": text_cache.stats(),
+            "audio_latency": audio.latency_stats(),
+            "click_latency": latency.summary(),
+        }
+        if prof.enabled:
+            stats["profile"] = prof.summary()
+        if PRINT_STATS:
+            print(f"[stats] partida: {stats}")
 
         # mostrar tela de resultados simples e esperar OK
-        return self._show_result_screen(player_name, score, play_time_elapsed)
+        result = self._show_result_screen(player_name, state.score, state.play_time, rank, summary)
+        result["stats"] = stats
+        return result
+
+    def _draw_match(self, sim, state, alpha=0.0, step_ms=0.0):
+        """
+        Desenha um quadro da partida: alvos do pool e HUD. alpha é a fração do
+        próximo passo já decorrida; o timer do HUD é interpolado com ela.
+        """
+        renderer = self.renderer
+        # restaura o fundo só onde houve alvos/labels no quadro anterior
+        renderer.begin_frame()
+
+        # alvos do pool (sombra no warning, alvo no active), partículas e
+        # "+pontos" numa única lista, desenhada com um Surface.blits
+        batch = self._batch
+        batch.clear()
+        pool = sim.targets
+        shadow_img, target_img = self.shadow_img, self.target_img
+        x, y, pool_state = pool.x, pool.y, pool.state
+        for i in range(pool.count):
+            batch.append((shadow_img if pool_state[i] == WARNING else target_img, (x[i], y[i])))
+        if self.effects:
+            self.effects.draw(batch)
+        if batch:
+            renderer.blits(batch)
+        prof = self.profiler
+        prof.lap("draw")
 
-    def _show_result_screen(self, player_name, score, play_time_seconds):
+        # UI: score e timer
+        score_surf = text_cache.render(self.font, f"Score: {state.score}", True, (255, 255, 255))
+        renderer.blit(score_surf, (10, 10))
+        # timer format mm:ss
+        secs = max(0, int(state.time_left - alpha * step_ms / 1000.0))
+        timer_surf = text_cache.render(self.font, f"Tempo: {secs}s", True, (255, 255, 255))
+        renderer.blit(timer_surf, (WIDTH - 130, 10))
+        prof.draw_overlay(renderer, self.small_font)
+        prof.lap("text")
+
+        renderer.present()
+        prof.lap("present")
+
+    def replay(self, log, realtime=True):
+        """
+        Reproduz uma partida gravada (MatchLog) desenhando-a. Com realtime=True
+        anda na velocidade original (desenhando até FPS quadros por segundo);
+        senão desenha cada passo o mais rápido possível. Não grava score.
+        Retorna o MatchState final.
+        """
+        sim = log.new_simulation()
+        state = sim.state
+        self.renderer.set_background(self.bg, (40, 120, 200))
+        effects = self.effects
+        if effects:
+            effects.clear()
+        popup = f"+{sim.score_per_hit}"
+        deadline = next_draw = time.perf_counter()
+        for dt, clicks in log.steps():
+            state = sim.step(dt, clicks)
+            if effects:
+                for pos in state.last_hits:
+                    effects.hit(pos, popup)
+                effects.update(dt)
+            if realtime:
+                # todo passo espera seu horário; só o desenho é pulado acima de FPS
+                deadline += dt / 1000.0
+                wait = deadline - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                if deadline < next_draw - dt / 2000.0:  # meia folga: soma de floats
+                    continue
+                next_draw = max(next_draw + 1.0 / FPS, deadline)
+            self.profiler.begin_frame()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return state
+            self._draw_match(sim, state)
+            self.profiler.end_frame()
+        return state
+
+    def _show_result_screen(self, player_name, score, play_time_seconds, rank=None, summary=None):
         """
         Mostra a pontuação final e espera clique em 'OK' para retornar.
+        rank: (posição, total) no ranking; summary: resumo do jogador
+        (ScoreManager.player_summary).
         """
         waiting = True
-        ok_rect = pygame.Rect((WIDTH//2 - 60, HEIGHT//2 + 40, 120, 40))
-        small_font = pygame.font.SysFont("arial", 20)
+        ok_rect = pygame.Rect((WIDTH//2 - 60, HEIGHT//2 + 45, 120, 40))
+        small_font = get_font(20)
+        renderer = self.renderer
+        renderer.set_background(self.bg, (30, 30, 30))
+        # tela estática: bloqueia esperando eventos em vez de desenhar a FPS
+        self.result_idle = idle = IdleWaiter(renderer, self.clock)
+        # o botão solto do clique que encerrou a partida (CLICK_ON_PRESS) ainda
+        # está na fila: só vale um MOUSEBUTTONUP depois de um MOUSEBUTTONDOWN desta tela
+        pressed = False
+        events = pygame.event.get()
         while waiting:
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     waiting = False
                     break
-                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    pressed = True
+                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1 and pressed:
                     if ok_rect.collidepoint(event.pos):
                         waiting = False
                         break
+            if not waiting:
+                break
 
-            if self.bg:
-                self.screen.blit(self.bg, (0, 0))
-            else:
-                self.screen.fill((30, 30, 30))
+            # só desenha quando o renderer pede o quadro completo
+            if renderer.pending:
+                renderer.begin_frame()
+                title = text_cache.render(self.large_font, "Fim de Jogo", True, (255, 255, 255))
+                title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//2 - 85))
+                self.screen.blit(title, title_rect)
 
-            title = self.large_font.render("Fim de Jogo", True, (255, 255, 255))
-            title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//2 - 60))
-            self.screen.blit(title, title_rect)
+                score_txt = text_cache.render(small_font, f"Jogador: {player_name}  |  Pontos: {score}  |  Tempo: {int(play_time_seconds)}s", True, (230, 230, 230))
+                st_rect = score_txt.get_rect(center=(WIDTH//2, HEIGHT//2 - 35))
+                self.screen.blit(score_txt, st_rect)
 
-            score_txt = small_font.render(f"Jogador: {player_name}  |  Pontos: {score}  |  Tempo: {int(play_time_seconds)}s", True, (230, 230, 230))
-            st_rect = score_txt.get_rect(center=(WIDTH//2, HEIGHT//2 - 10))
-            self.screen.blit(score_txt, st_rect)
+                if rank:
+                    rank_txt = text_cache.render(small_font, f"Posição #{rank[0]} de {rank[1]}", True, (255, 215, 0))
+                    self.screen.blit(rank_txt, rank_txt.get_rect(center=(WIDTH//2, HEIGHT//2 - 10)))
+                if summary:
+                    summary_txt = text_cache.render(
+                        small_font,
+                        f"Recorde: {summary['best']}  |  Média: {summary['average']:.1f}  |  Partidas: {summary['matches']}",
+                        True, (200, 200, 200))
+                    self.screen.blit(summary_txt, summary_txt.get_rect(center=(WIDTH//2, HEIGHT//2 + 15)))
 
-            # botão OK
-            pygame.draw.rect(self.screen, (180, 180, 180), ok_rect, border_radius=6)
-            ok_txt = small_font.render("OK", True, (10, 10, 10))
-            ok_txt_rect = ok_txt.get_rect(center=ok_rect.center)
-            self.screen.blit(ok_txt, ok_txt_rect)
+                # botão OK
+                pygame.draw.rect(self.screen, (180, 180, 180), ok_rect, border_radius=6)
+                ok_txt = text_cache.render(small_font, "OK", True, (10, 10, 10))
+                ok_txt_rect = ok_txt.get_rect(center=ok_rect.center)
+                self.screen.blit(ok_txt, ok_txt_rect)
 
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                renderer.present()
+                idle.frame_drawn()
+            events = idle.wait()
 
+        if PRINT_STATS:
+            print(f"[stats] tela de resultado: idle={idle.stats()}")
         return {"player": player_name, "points": score, "play_time_seconds": play_time_seconds}
@@ -0,0 +1,89 @@
+# idle.py
+import time
+
+import pygame
+
+from code.settings import FPS, IDLE_RENDERING, IDLE_TIMEOUT_MS
+
+# eventos em que o sistema pede para repintar a janela
+_EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+
+
+class IdleWaiter:
+    """
+    Espera por eventos nas telas estáticas (menu, nome, scoreboard, resultado)
+    em vez de desenhar FPS quadros por segundo. Uso por iteração:
+      events = idle.wait(animating)   # bloqueia até chegar evento (ou timeout)
+      ... trata eventos ...
+      if nada mudou: continue         # quadro pulado
+      ... desenha e present() ...; idle.frame_drawn()
+
+    Com animating=True (ex.: overlay do profiler) acorda a cada quadro.
+    frames_skipped conta os quadros que um loop a FPS teria desenhado no
+    tempo passado nos loops deste waiter (active_ms). Quem roda outra tela
+    com outro loop entre dois wait() (ex.: a partida) chama resume() na
+    volta: esse intervalo não conta.
+    Com IDLE_RENDERING desligado volta ao loop contínuo (clock.tick + get).
+    """
+
+    def __init__(self, renderer, clock=None, fps=FPS, timeout_ms=IDLE_TIMEOUT_MS, enabled=IDLE_RENDERING):
+        self.renderer = renderer
+        self.clock = clock or pygame.time.Clock()
+        self.fps = fps
+        self.frame_ms = 1000.0 / fps
+        self.timeout_ms = timeout_ms
+        self.enabled = enabled
+        self.wakeups = 0
+        self.drawn = 0
+        self.idle_ms = 0.0    # tempo bloqueado esperando eventos
+        self.active_ms = 0.0  # tempo nos loops deste waiter (esperando ou desenhando)
+        self._last_frame = 0.0
+        self._last_return = None  # fim do último wait(); None = não conta até o próximo
+
+    def wait(self, animating=False):
+        """
+        Retorna a lista de eventos pendentes, bloqueando enquanto não houver
+        nenhum. Eventos de exposição da janela invalidam o renderer.
+        """
+        t0 = time.perf_counter()
+        if self._last_return is not None:
+            self.active_ms += (t0 - self._last_return) * 1000.0
+        if not self.enabled:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            if animating:
+                # até o próximo quadro, mas acorda antes se chegar evento
+                remaining = self.frame_ms - (t0 - self._last_frame) * 1000.0
+                timeout = max(1, int(remaining))
+            else:
+                timeout = self.timeout_ms
+            first = pygame.event.wait(timeout)
+            events = [] if first.type == pygame.NOEVENT else [first] + pygame.event.get()
+            self.idle_ms += (time.perf_counter() - t0) * 1000.0
+        self._last_return = time.perf_counter()
+        self.active_ms += (self._last_return - t0) * 1000.0
+        self.wakeups += 1
+        for event in events:
+            if event.type in _EXPOSE_EVENTS:
+                self.renderer.invalidate()
+        return events
+
+    def resume(self):
+        """
+        O tempo desde o último wait() foi de outra tela: não conta em active_ms.
+        """
+        self._last_return = None
+
+    def frame_drawn(self):
+        self.drawn += 1
+        self._last_frame = time.perf_counter()
+
+    def stats(self):
+        return {
+            "frames_drawn": self.drawn,
+            "frames_skipped": max(0, int(self.active_ms * self.fps / 1000.0) - self.drawn),
+            "wakeups": self.wakeups,
+            "idle_ms": round(self.idle_ms, 1),
+            "active_ms": round(self.active_ms, 1),
+        }
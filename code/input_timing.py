@@ -0,0 +1,79 @@
+# input_timing.py
+import time
+from collections import deque
+
+import pygame
+
+
+class TimedEvents:
+    """
+    Espera o início do próximo quadro recolhendo eventos com o instante
+    (perf_counter) em que chegaram. Substitui clock.tick() + event.get() na
+    partida: em vez de dormir até o quadro seguinte e só então ler a fila,
+    bloqueia em pygame.event.wait(), que volta assim que chega um evento.
+    Assim cada clique tem seu próprio horário, com precisão de ~1 ms, e não
+    o horário do quadro em que foi lido.
+
+    O pygame não expõe o timestamp do SDL; eventos que chegaram enquanto o
+    quadro anterior era desenhado recebem o horário do início da espera.
+    """
+
+    def __init__(self, fps_cap):
+        self.frame_s = 1.0 / fps_cap if fps_cap else 0.0
+        self._next = None
+
+    def wait_frame(self):
+        """
+        Retorna [(t, evento), ...] até o próximo quadro (fps_cap = 0: só lê a fila).
+        """
+        now = time.perf_counter()
+        events = [(now, e) for e in pygame.event.get()]
+        if not self.frame_s:
+            return events
+        if self._next is None or self._next < now:
+            self._next = now  # atrasado: não tenta compensar quadros perdidos
+        self._next += self.frame_s
+        while True:
+            remaining = self._next - time.perf_counter()
+            if remaining < 0.0005:
+                break
+            event = pygame.event.wait(max(1, int(remaining * 1000.0)))
+            if event.type != pygame.NOEVENT:
+                events.append((time.perf_counter(), event))
+        return events
+
+
+class ClickLatency:
+    """
+    Latência por clique, em ms: evento -> aplicado na simulação (processed)
+    e evento -> quadro com o resultado enviado à tela (presented).
+    Guarda as últimas 'size' amostras.
+    """
+
+    def __init__(self, size=1024):
+        self.processed = deque(maxlen=size)
+        self.presented = deque(maxlen=size)
+        self.clicks = 0
+
+    def add(self, event_t, processed_t, presented_t):
+        self.processed.append((processed_t - event_t) * 1000.0)
+        self.presented.append((presented_t - event_t) * 1000.0)
+        self.clicks += 1
+
+    @staticmethod
+    def _summary(values):
+        values = sorted(values)
+        if not values:
+            return {}
+        return {
+            "p50": round(values[len(values) // 2], 3),
+            "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+            "max": round(values[-1], 3),
+        }
+
+    def summary(self):
+        return {
+            "clicks": self.clicks,
+            "processed_ms": self._summary(self.processed),
+            "presented_ms": self._summary(self.presented),
+        }
@@ -1,114 +1,180 @@
 # menu.py
+import time
+
 import pygame
 
 from code.settings import MENU_BG
 from code.ui import Button
-from code.game import Game
-from code.score_manager import ScoreManager
+from code.score_manager import get_score_manager
+from code.asset_cache import asset_cache
+from code.renderer import DirtyRenderer
+from code.text_cache import text_cache
+from code.profiler import FrameProfiler
+from code.fonts import get_font
+from code.audio import audio
+from code.idle import IdleWaiter
 import code.settings as settings
 
+# fases medidas pelo profiler nos loops do menu
+MENU_PHASES = ("events", "draw", "present")
+
+
 class Menu:
     """
     Menu principal com 3 opções: Iniciar jogo, Score e Sair.
     Também mostra tela de pontuação (Score) com nome e pontos/hora.
     """
 
-    def __init__(self, screen, clock):
+    def __init__(self, screen, clock, score_manager=None, game_class=None, sim_params=None):
         self.screen = screen
         self.clock = clock
+        # classe da partida (padrão: Game, importado só na primeira partida) e
+        # argumentos extras da Simulation; o modo soak (code/soak.py) troca os dois
+        self.game_class = game_class
+        self.sim_params = sim_params
         self.screen_rect = screen.get_rect()
-        self.score_manager = ScoreManager()
-        self.font = pygame.font.SysFont("arial", 22)
-        self.large_font = pygame.font.SysFont("arial", 36)
+        self.score_manager = score_manager if score_manager is not None else get_score_manager()
+        self.font = get_font(22)
+        self.large_font = get_font(36)
 
         # carregar background de menu
         try:
-            self.bg = pygame.image.load(MENU_BG).convert()
-            self.bg = pygame.transform.scale(self.bg, (settings.WIDTH, settings.HEIGHT))
+            self.bg = asset_cache.get(MENU_BG, (settings.WIDTH, settings.HEIGHT), mode="opaque", smooth=False)
         except Exception:
             self.bg = None
 
+        # compartilhado pelas telas do menu; cada tela define seu fundo
+        self.renderer = DirtyRenderer(self.screen, self.bg, (20, 90, 150))
+        self.profiler = FrameProfiler(MENU_PHASES)
+        self.small_font = get_font(14)
+        # telas do menu só desenham quando algo muda (ver code/idle.py)
+        self.idle = IdleWaiter(self.renderer, self.clock)
+
         # criar botões
         self.buttons = []
         midx = settings.WIDTH // 2
         self._create_buttons(midx)
 
-        # música do menu (opcional)
-        try:
-            pygame.mixer.music.load(settings.MENU_MUSIC)
-            pygame.mixer.music.play(-1)
-        except Exception:
-            pass
+        # música do menu começa depois do primeiro quadro (ver loop)
+        self.music_started = False
+        # instante (perf_counter) em que o primeiro quadro foi apresentado
+        self.first_frame_at = None
 
     def _create_buttons(self, midx):
         btn_w, btn_h = 200, 50
         spacing = 12
         start_y = 240
-        font = pygame.font.SysFont("arial", 24)
+        font = get_font(24)
         self.buttons = [
             Button((midx - btn_w//2, start_y, btn_w, btn_h), "Iniciar Jogo", font, self._on_start),
             Button((midx - btn_w//2, start_y + (btn_h + spacing), btn_w, btn_h), "Score", font, self._on_score),
             Button((midx - btn_w//2, start_y + 2*(btn_h + spacing), btn_w, btn_h), "Sair", font, self._on_exit),
         ]
 
-    def loop(self):
+    def loop(self, first_frame_only=False):
         """
         Loop do menu principal. Retorna False quando o usuário escolhe 'Sair'.
+        first_frame_only: retorna logo após apresentar o primeiro quadro
+        (medição de tempo de abertura, ver main.py --startup-time).
         """
         running = True
+        renderer = self.renderer
+        renderer.set_background(self.bg, (20, 90, 150))
+        prof = self.profiler
+        idle = self.idle
+        events = pygame.event.get()
         while running:
-            for event in pygame.event.get():
+            prof.begin_frame()
+            for event in events:
                 if event.type == pygame.QUIT:
+                    self._print_stats()
                     return False
+                if prof.handle_event(event):
+                    renderer.invalidate()
+                    continue
                 for b in self.buttons:
-                    b.handle_event(event)
+                    if b.handle_event(event):
+                        # outra tela usou o display: volta com o fundo do menu
+                        renderer.set_background(self.bg, (20, 90, 150))
+                        # e o tempo dela não conta como custo deste quadro nem como tempo ocioso
+                        prof.begin_frame()
+                        idle.resume()
+            prof.lap("events")
 
-            if self.bg:
-                self.screen.blit(self.bg, (0, 0))
-            else:
-                self.screen.fill((20, 90, 150))
+            animating = prof.enabled and prof.show_overlay
+            if animating:
+                # overlay muda todo quadro e fica sobre o título: redesenha tudo
+                renderer.invalidate()
+            if renderer.pending or any(b.dirty for b in self.buttons):
+                self._draw_menu_frame()
+                if self.first_frame_at is None:
+                    self.first_frame_at = time.perf_counter()
+                    if first_frame_only:
+                        return False
+                if not self.music_started:
+                    # abrir o mixer e decodificar a música não atrasa o primeiro quadro
+                    audio.play_music(settings.MENU_MUSIC)
+                    audio.preload_music(settings.GAME_MUSIC)
+                    self.music_started = True
+            audio.update()  # música que terminou de decodificar começa aqui
+            events = idle.wait(animating)
 
-            title = self.large_font.render("Speed of Light", True, (255, 255, 255))
+        self._print_stats()
+        return False
+
+    def _draw_menu_frame(self):
+        renderer = self.renderer
+        prof = self.profiler
+        renderer.begin_frame()
+        if renderer.full_redraw:
+            title = text_cache.render(self.large_font, "Speed of Light", True, (255, 255, 255))
             title_rect = title.get_rect(center=(settings.WIDTH//2, 120))
             self.screen.blit(title, title_rect)
 
             for b in self.buttons:
                 b.draw(self.screen)
+        else:
+            # só os botões cujo hover mudou
+            for b in self.buttons:
+                if b.dirty:
+                    renderer.restore(b.rect)
+                    b.draw(self.screen)
+        prof.draw_overlay(renderer, self.small_font)
+        prof.lap("draw")
 
-            pygame.display.flip()
-            self.clock.tick(settings.FPS)
+        renderer.present()
+        prof.lap("present")
+        prof.end_frame()
+        self.idle.frame_drawn()
 
-        return False
+    def _print_stats(self):
+        if settings.PRINT_STATS:
+            print(f"[stats] menu: render={self.renderer.stats()} idle={self.idle.stats()} "
+                  f"text_cache={text_cache.stats()}")
+            if self.profiler.enabled:
+                print(f"[stats] menu profile: {self.profiler.summary()}")
 
     def _on_start(self):
         """
         Callback do botão iniciar: solicita nome e inicia Game.run.
         """
         # pausar música do menu para partida
-        try:
-            pygame.mixer.music.stop()
-        except Exception:
-            pass
+        audio.pause_music()
 
         player_name = self._ask_player_name()
         if not player_name:
-            # se o jogador cancelar, retorna ao menu e retoma música
-            try:
-                pygame.mixer.music.load(settings.MENU_MUSIC)
-                pygame.mixer.music.play(-1)
-            except Exception:
-                pass
+            # se o jogador cancelar, retorna ao menu e retoma música de onde parou
+            audio.play_music(settings.MENU_MUSIC)
             return
 
-        game = Game(self.screen, self.clock)
+        # importado só na primeira partida: não pesa na abertura do jogo
+        from code.game import Game
+        game_class = self.game_class or Game
+        game = game_class(self.screen, self.clock, self.score_manager, sim_params=self.sim_params)
         result = game.run(player_name)
 
-        # após partida, retocar música do menu
-        try:
-            pygame.mixer.music.load(settings.MENU_MUSIC)
-            pygame.mixer.music.play(-1)
-        except Exception:
-            pass
+        # após partida, retocar música do menu (do início, sem decodificar de novo)
+        audio.play_music(settings.MENU_MUSIC, restart=True)
 
     def _ask_player_name(self):
         """
@@ -118,10 +184,17 @@ class Menu:
         active = True
         name = ""
         input_rect = pygame.Rect(settings.WIDTH//2 - 200, settings.HEIGHT//2 - 20, 400, 40)
-        base_font = pygame.font.SysFont("arial", 24)
+        base_font = get_font(24)
+        renderer = self.renderer
+        renderer.set_background(self.bg, (15, 15, 15))
+        name_changed = True
+        prof = self.profiler
+        idle = self.idle
+        events = pygame.event.get()
 
         while active:
-            for event in pygame.event.get():
+            prof.begin_frame()
+            for event in events:
                 if event.type == pygame.QUIT:
                     return None
                 elif event.type == pygame.KEYDOWN:
@@ -129,73 +202,119 @@ class Menu:
                         return name.strip() or "Jogador"
                     elif event.key == pygame.K_BACKSPACE:
                         name = name[:-1]
+                        name_changed = True
                     elif event.key == pygame.K_ESCAPE:
                         return None
                     else:
                         if len(name) < 20:
                             name += event.unicode
+                            name_changed = True
+            prof.lap("events")
 
-            if self.bg:
-                self.screen.blit(self.bg, (0, 0))
-            else:
-                self.screen.fill((15, 15, 15))
+            # só desenha quando o nome muda (ou a tela precisa ser repintada)
+            if name_changed or renderer.pending:
+                renderer.begin_frame()
+                if renderer.full_redraw:
+                    prompt = text_cache.render(base_font, "Digite seu nome e pressione Enter (Esc para cancelar):", True, (230, 230, 230))
+                    self.screen.blit(prompt, (settings.WIDTH//2 - prompt.get_width()//2, settings.HEIGHT//2 - 80))
+                    name_changed = True
 
-            prompt = base_font.render("Digite seu nome e pressione Enter (Esc para cancelar):", True, (230, 230, 230))
-            self.screen.blit(prompt, (settings.WIDTH//2 - prompt.get_width()//2, settings.HEIGHT//2 - 80))
+                if name_changed:
+                    # redesenha só a caixa de texto
+                    renderer.restore(input_rect)
+                    pygame.draw.rect(self.screen, (255, 255, 255), input_rect, 2)
+                    txt_surface = text_cache.render(base_font, name, True, (255, 255, 255))
+                    self.screen.blit(txt_surface, (input_rect.x + 8, input_rect.y + 6), area=pygame.Rect(0, 0, input_rect.w - 10, input_rect.h - 8))
+                    name_changed = False
+                prof.lap("draw")
 
-            pygame.draw.rect(self.screen, (255, 255, 255), input_rect, 2)
-            txt_surface = base_font.render(name, True, (255, 255, 255))
-            self.screen.blit(txt_surface, (input_rect.x + 8, input_rect.y + 6))
-
-            pygame.display.flip()
-            self.clock.tick(settings.FPS)
+                renderer.present()
+                prof.lap("present")
+                prof.end_frame()
+                idle.frame_drawn()
+            events = idle.wait()
 
     def _on_score(self):
         """
-        Exibe a tela de scores (top 10).
+        Exibe a tela de scores, 10 por página. Setas/PageUp/PageDown trocam de
+        página (paginação por cursor, sem OFFSET).
         """
-        rows = self.score_manager.top_scores(10)
+        page_size = 10
+        cursors = [None]  # cursor de início de cada página visitada
+        rows, next_cursor = self.score_manager.scores_page(page_size)
+        renderer = self.renderer
+        renderer.set_background(self.bg, (10, 10, 10))
+        prof = self.profiler
+        idle = self.idle
         showing = True
+        events = pygame.event.get()
         while showing:
-            for event in pygame.event.get():
+            prof.begin_frame()
+            for event in events:
                 if event.type == pygame.QUIT:
                     showing = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         showing = False
+                    elif event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN) and next_cursor is not None:
+                        cursors.append(next_cursor)
+                        rows, next_cursor = self.score_manager.scores_page(page_size, next_cursor)
+                        renderer.invalidate()
+                    elif event.key in (pygame.K_LEFT, pygame.K_PAGEUP) and len(cursors) > 1:
+                        cursors.pop()
+                        rows, next_cursor = self.score_manager.scores_page(page_size, cursors[-1])
+                        renderer.invalidate()
                 elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                     # clique para voltar
                     showing = False
 
-            if self.bg:
-                self.screen.blit(self.bg, (0, 0))
-            else:
-                self.screen.fill((10, 10, 10))
-
-            title = self.large_font.render("Scoreboard (Top 10)", True, (255, 255, 255))
-            self.screen.blit(title, (settings.WIDTH//2 - title.get_width()//2, 40))
-
-            y = 120
-            small = self.font
-            if not rows:
-                no_txt = small.render("Nenhuma pontuação registrada.", True, (220, 220, 220))
-                self.screen.blit(no_txt, (settings.WIDTH//2 - no_txt.get_width()//2, y))
-            else:
-                # cabeçalho
-                hdr = small.render(f"{'Jogador':<20}{'Pontos':>8}{'Tempo(s)':>12}", True, (220,220,220))
-                self.screen.blit(hdr, (80, y))
-                y += 30
-                for r in rows:
-                    player_name, points, play_time_seconds, created_at = r
-                    line = small.render(f"{player_name:<20}{points:>8}{int(play_time_seconds):>12}", True, (210,210,210))
-                    self.screen.blit(line, (80, y))
-                    y += 26
-
-            hint = self.font.render("Pressione Esc ou clique para voltar.", True, (180, 180, 180))
-            self.screen.blit(hint, (settings.WIDTH//2 - hint.get_width()//2, settings.HEIGHT - 50))
-
-            pygame.display.flip()
-            self.clock.tick(settings.FPS)
+            prof.lap("events")
+            if not showing:
+                break
+
+            # tela estática: só desenha quando o renderer pede o quadro completo
+            if renderer.pending:
+                renderer.begin_frame()
+                if renderer.full_redraw:
+                    self._draw_scoreboard(rows, (len(cursors) - 1) * page_size + 1)
+                prof.lap("draw")
+
+                renderer.present()
+                prof.lap("present")
+                prof.end_frame()
+                idle.frame_drawn()
+            audio.update()
+            events = idle.wait()
+
+    def _draw_scoreboard(self, rows, first):
+        """
+        Desenha uma página do scoreboard; 'first' é a posição da primeira linha.
+        """
+        if first == 1:
+            title_text = "Scoreboard (Top 10)"
+        else:
+            title_text = f"Scoreboard ({first}-{first + len(rows) - 1})"
+        title = text_cache.render(self.large_font, title_text, True, (255, 255, 255))
+        self.screen.blit(title, (settings.WIDTH//2 - title.get_width()//2, 40))
+
+        y = 120
+        small = self.font
+        if not rows:
+            no_txt = text_cache.render(small, "Nenhuma pontuação registrada.", True, (220, 220, 220))
+            self.screen.blit(no_txt, (settings.WIDTH//2 - no_txt.get_width()//2, y))
+        else:
+            # cabeçalho
+            hdr = text_cache.render(small, f"{'Jogador':<20}{'Pontos':>8}{'Tempo(s)':>12}", True, (220,220,220))
+            self.screen.blit(hdr, (80, y))
+            y += 30
+            for r in rows:
+                player_name, points, play_time_seconds, created_at = r
+                line = text_cache.render(small, f"{player_name:<20}{points:>8}{int(play_time_seconds):>12}", True, (210,210,210))
+                self.screen.blit(line, (80, y))
+                y += 26
+
+        hint = text_cache.render(self.font, "Setas: página  |  Esc ou clique para voltar.", True, (180, 180, 180))
+        self.screen.blit(hint, (settings.WIDTH//2 - hint.get_width()//2, settings.HEIGHT - 50))
 
     def _on_exit(self):
         """
@@ -0,0 +1,145 @@
+# profiler.py
+import csv
+import time
+
+import pygame
+
+from code.settings import PROFILE, PROFILE_FRAMES
+
+
+class FrameProfiler:
+    """
+    Mede o tempo de cada fase de um quadro em buffers circulares de tamanho fixo.
+    Uso por quadro:
+      prof.begin_frame()
+      ...; prof.lap("events")   # tempo desde a marca anterior vai para "events"
+      ...; prof.lap("draw")
+      prof.end_frame()
+    Fases repetidas no mesmo quadro (ex.: vários passos de simulação) somam.
+    Desabilitado, cada chamada só testa um booleano.
+    """
+
+    def __init__(self, phases, size=PROFILE_FRAMES, enabled=PROFILE):
+        self.phases = tuple(phases)
+        self.size = size
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self._index = {name: i for i, name in enumerate(self.phases)}
+        # um buffer por fase + total do quadro, em segundos
+        self._buffers = [[0.0] * size for _ in self.phases]
+        self._totals = [0.0] * size
+        self._current = [0.0] * len(self.phases)
+        self._pos = 0      # próxima posição a escrever
+        self._count = 0    # quadros válidos no buffer
+        self._last = 0.0
+        self.frames = 0    # total de quadros medidos
+        self._overlay_surfs = []
+        self._overlay_at = 0.0
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            # ligado no meio do quadro (F3): o begin_frame deste quadro não rodou
+            for i in range(len(self._current)):
+                self._current[i] = 0.0
+            self._last = time.perf_counter()
+        self.enabled = enabled
+        self.show_overlay = enabled
+
+    def handle_event(self, event):
+        """
+        F3 liga/desliga profiler e overlay. Retorna True se o evento foi usado.
+        """
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.set_enabled(not self.enabled)
+            return True
+        return False
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        current = self._current
+        for i in range(len(current)):
+            current[i] = 0.0
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[self._index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        pos = self._pos
+        total = 0.0
+        for buf, value in zip(self._buffers, self._current):
+            buf[pos] = value
+            total += value
+        self._totals[pos] = total
+        self._pos = (pos + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+        self.frames += 1
+
+    def _ordered(self, buf):
+        # amostras válidas, da mais antiga para a mais recente
+        if self._count < self.size:
+            return buf[:self._count]
+        return buf[self._pos:] + buf[:self._pos]
+
+    @staticmethod
+    def _percentile(sorted_values, q):
+        if not sorted_values:
+            return 0.0
+        k = min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))
+        return sorted_values[k]
+
+    def summary(self):
+        """
+        {fase: {"p50", "p95", "p99", "max"}} em ms, incluindo "frame" (soma das fases).
+        """
+        result = {}
+        for name, buf in zip(self.phases + ("frame",), self._buffers + [self._totals]):
+            values = sorted(self._ordered(buf))
+            result[name] = {
+                "p50": self._percentile(values, 50) * 1000.0,
+                "p95": self._percentile(values, 95) * 1000.0,
+                "p99": self._percentile(values, 99) * 1000.0,
+                "max": (values[-1] if values else 0.0) * 1000.0,
+            }
+        return result
+
+    def export_csv(self, path):
+        """
+        Grava os quadros do buffer (ms por fase) em CSV. Retorna quantas linhas.
+        """
+        columns = [self._ordered(buf) for buf in self._buffers] + [self._ordered(self._totals)]
+        first = self.frames - self._count
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame",) + self.phases + ("total",))
+            for row, values in enumerate(zip(*columns)):
+                writer.writerow([first + row] + [f"{v * 1000.0:.4f}" for v in values])
+        return self._count
+
+    def draw_overlay(self, renderer, font, pos=(10, 40)):
+        """
+        Desenha p50/p95/p99/pior quadro por fase via DirtyRenderer (transitório).
+        O texto é rasterizado no máximo duas vezes por segundo (fora do
+        text_cache, para não poluí-lo com valores que mudam sempre).
+        """
+        if not (self.enabled and self.show_overlay):
+            return
+        now = time.perf_counter()
+        if now - self._overlay_at >= 0.5:
+            self._overlay_at = now
+            self._overlay_surfs = [
+                font.render(f"{name:<9} p50 {s['p50']:6.2f}  p95 {s['p95']:6.2f}  "
+                            f"p99 {s['p99']:6.2f}  max {s['max']:6.2f} ms", True, (255, 255, 0))
+                for name, s in self.summary().items()
+            ]
+        x, y = pos
+        for surf in self._overlay_surfs:
+            renderer.blit(surf, (x, y))
+            y += surf.get_height()
@@ -0,0 +1,157 @@
+# renderer.py
+import pygame
+
+from code.settings import DIRTY_RECTS, DIRTY_MAX_RATIO, BLITS_MERGE_OVER
+
+
+class DirtyRenderer:
+    """
+    Renderização por retângulos sujos. Uso por quadro:
+      renderer.begin_frame()          # restaura o fundo sob o que mudou
+      if renderer.full_redraw: ...    # desenha o conteúdo estático
+      renderer.blit(surf, pos)        # desenha e marca a área
+      renderer.present()              # display.update(rects) ou flip()
+
+    Blits "transient" (padrão) são apagados no próximo begin_frame(), então
+    sprites e labels que mudam a cada quadro podem ser redesenhados sem
+    repintar a tela toda. Quando a área suja passa de max_ratio da tela, ou
+    quando o renderer está desabilitado, cai para um flip() completo.
+    """
+
+    def __init__(self, screen, background=None, fill_color=(0, 0, 0), enabled=DIRTY_RECTS, max_ratio=DIRTY_MAX_RATIO):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.enabled = enabled
+        self.max_ratio = max_ratio
+        self.background = background
+        self.fill_color = fill_color
+
+        self.full_redraw = True
+        self._dirty = []
+        self._erase = []   # áreas transitórias do quadro anterior
+        self._drawn = []   # áreas transitórias deste quadro
+
+        # estatísticas
+        self.pixels_pushed = 0  # pixels enviados no último present()
+        self.total_pixels_pushed = 0
+        self.frames = 0
+        self.full_frames = 0
+
+    def set_background(self, background, fill_color=(0, 0, 0)):
+        self.background = background
+        self.fill_color = fill_color
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Força o próximo quadro a redesenhar e enviar a tela inteira.
+        """
+        self.full_redraw = True
+
+    @property
+    def pending(self):
+        """
+        True se há algo a enviar: quadro completo pedido, áreas marcadas ou
+        transitórios do quadro anterior a apagar. Telas ociosas só desenham
+        quando isso (ou o próprio conteúdo) muda.
+        """
+        return self.full_redraw or bool(self._dirty) or bool(self._erase)
+
+    def begin_frame(self):
+        if not self.enabled:
+            self.full_redraw = True
+        if self.full_redraw:
+            if self.background:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                self.screen.fill(self.fill_color)
+        else:
+            for rect in self._erase:
+                self.restore(rect)
+        self._erase = []
+        self._drawn = []
+
+    def restore(self, rect):
+        """
+        Repinta o fundo na área 'rect' e a marca como suja.
+        """
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if not rect:
+            return
+        if self.background:
+            self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill(self.fill_color, rect)
+        self._dirty.append(rect)
+
+    def blit(self, surf, dest, transient=True):
+        """
+        Desenha 'surf' em 'dest' (posição ou Rect) e marca a área. Retorna o Rect.
+        """
+        rect = self.screen.blit(surf, dest)
+        self.mark(rect, transient)
+        return rect
+
+    def blits(self, blit_sequence, transient=True, merge_over=BLITS_MERGE_OVER):
+        """
+        Desenha uma lista de (surf, dest) numa única chamada Surface.blits e
+        marca as áreas. Com mais de merge_over itens (ex.: partículas) marca
+        só a união delas: um retângulo em vez de milhares para apagar/enviar.
+        Retorna os Rects desenhados.
+        """
+        rects = self.screen.blits(blit_sequence)
+        if len(rects) > merge_over:
+            self.mark(rects[0].unionall(rects), transient)
+        else:
+            for rect in rects:
+                self.mark(rect, transient)
+        return rects
+
+    def mark(self, rect, transient=False):
+        """
+        Marca uma área desenhada por fora (ex.: pygame.draw) para ser enviada.
+        Com transient=True ela também é apagada no próximo quadro.
+        """
+        rect = pygame.Rect(rect)
+        self._dirty.append(rect)
+        if transient:
+            self._drawn.append(rect)
+
+    def present(self):
+        """
+        Envia o quadro para a tela. Retorna a quantidade de pixels enviados.
+        """
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if self.full_redraw:
+            pushed = screen_area
+        else:
+            # soma das áreas (sobreposições contam duas vezes: estimativa conservadora)
+            pushed = 0
+            for rect in self._dirty:
+                pushed += rect.width * rect.height
+            if pushed > screen_area * self.max_ratio:
+                self.full_redraw = True
+                pushed = screen_area
+
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_frames += 1
+        elif self._dirty:
+            pygame.display.update(self._dirty)
+
+        self.pixels_pushed = pushed
+        self.total_pixels_pushed += pushed
+        self.frames += 1
+        self.full_redraw = False
+        self._dirty = []
+        self._erase = self._drawn
+        self._drawn = []
+        return pushed
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "pixels_pushed": self.pixels_pushed,
+            "avg_pixels_per_frame": self.total_pixels_pushed / self.frames if self.frames else 0,
+        }
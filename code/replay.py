@@ -0,0 +1,161 @@
+# replay.py
+import json
+import random
+import struct
+
+from code.simulation import Simulation
+
+# Formato binário (little-endian):
+#   cabeçalho: magic "SOLR", versão (u8), seed (u64), largura, altura, alvo w, alvo h (u16)
+#   v1 (passo variável):
+#     quadros: dt em ms (f64), quantidade de cliques (u16), cliques (x, y u16) * n
+#   v2 (passo fixo):
+#     passo em ms (f64)
+#     registros: índice do passo (u32), quantidade de cliques (u16), cliques (x, y u16) * n
+#     só passos com cliques são gravados; o último registro (n = 0) marca o total de passos
+#   v3 (passo fixo + regras):
+#     como v2, com os argumentos extras da Simulation (sim_params) entre o
+#     passo e os registros: tamanho (u32) + JSON em utf-8
+MAGIC = b"SOLR"
+VERSION = 3
+_HEADER = struct.Struct("<4sBQHHHH")
+_STEP_MS = struct.Struct("<d")
+_PARAMS_LEN = struct.Struct("<I")
+_FRAME = struct.Struct("<dH")
+_RECORD = struct.Struct("<IH")
+_CLICK = struct.Struct("<HH")
+
+
+class MatchRecorder:
+    """
+    Grava seed + cliques de cada passo de simulação, o suficiente para
+    reproduzir a partida exatamente com a mesma Simulation. Como a simulação
+    anda em passo fixo, o log não depende do FPS da gravação. Uso:
+      stepper.recorder = MatchRecorder(...)   # FixedStepper chama record_step()
+      ...
+      recorder.finish(stepper.steps); recorder.save(path)
+    """
+
+    def __init__(self, seed, width, height, target_size, step_ms, sim_params=None):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.target_size = tuple(target_size)
+        self.step_ms = step_ms
+        self.sim_params = dict(sim_params or {})
+        params = json.dumps(self.sim_params, sort_keys=True).encode("utf-8")
+        self._buf = bytearray(_HEADER.pack(MAGIC, VERSION, seed, width, height, *self.target_size))
+        self._buf += _STEP_MS.pack(step_ms)
+        self._buf += _PARAMS_LEN.pack(len(params)) + params
+        self._finished = False
+
+    def record_step(self, step_index, clicks):
+        """
+        Registra os cliques aplicados no passo 'step_index' (0 = primeiro passo).
+        """
+        if not clicks:
+            return
+        buf = self._buf
+        buf += _RECORD.pack(step_index, len(clicks))
+        for x, y in clicks:
+            buf += _CLICK.pack(x, y)
+
+    def finish(self, total_steps):
+        if not self._finished:
+            self._buf += _RECORD.pack(total_steps, 0)
+            self._finished = True
+
+    def to_bytes(self):
+        return bytes(self._buf)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self._buf)
+
+
+class MatchLog:
+    """
+    Partida gravada por MatchRecorder. Uso:
+      log = MatchLog.load(path)
+      for dt, clicks in log.steps(): sim.step(dt, clicks)
+    """
+
+    def __init__(self, data):
+        if len(data) < _HEADER.size:
+            raise ValueError("arquivo de replay truncado")
+        magic, version, seed, width, height, tw, th = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("não é um arquivo de replay")
+        if version not in (1, 2, 3):
+            raise ValueError(f"versão de replay não suportada: {version}")
+        self.data = data
+        self.version = version
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.target_size = (tw, th)
+        self._body = _HEADER.size
+        self.step_ms = None  # v1: passo variável
+        self.sim_params = {}  # v1/v2: regras padrão
+        if version >= 2:
+            (self.step_ms,) = _STEP_MS.unpack_from(data, _HEADER.size)
+            self._body += _STEP_MS.size
+        if version >= 3:
+            (size,) = _PARAMS_LEN.unpack_from(data, self._body)
+            start = self._body + _PARAMS_LEN.size
+            self.sim_params = json.loads(data[start:start + size].decode("utf-8"))
+            self._body = start + size
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def _read_clicks(self, offset, n):
+        data = self.data
+        return [_CLICK.unpack_from(data, offset + i * _CLICK.size) for i in range(n)]
+
+    def steps(self):
+        """
+        Gera (dt, [(x, y), ...]) para cada passo de simulação, em ordem.
+        """
+        data = self.data
+        offset = self._body
+        end = len(data)
+        if self.version == 1:
+            while offset < end:
+                dt, n = _FRAME.unpack_from(data, offset)
+                offset += _FRAME.size
+                yield dt, self._read_clicks(offset, n)
+                offset += n * _CLICK.size
+            return
+
+        step_ms = self.step_ms
+        step = 0
+        while offset < end:
+            index, n = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            while step < index:
+                yield step_ms, ()
+                step += 1
+            if n:
+                yield step_ms, self._read_clicks(offset, n)
+                offset += n * _CLICK.size
+                step += 1
+
+    def new_simulation(self):
+        """
+        Simulation no mesmo estado inicial (e com as mesmas regras) da partida gravada.
+        """
+        return Simulation(self.width, self.height, target_size=self.target_size, rng=random.Random(self.seed),
+                          **self.sim_params)
+
+
+def replay_headless(log):
+    """
+    Reproduz a partida sem display, o mais rápido possível. Retorna o MatchState final.
+    """
+    sim = log.new_simulation()
+    for dt, clicks in log.steps():
+        sim.step(dt, clicks)
+    return sim.state
@@ -0,0 +1,303 @@
+# score_client.py
+import base64
+import datetime
+import itertools
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+from code.settings import SCORE_QUEUE_FILE
+
+RETRY_MIN_S = 1.0       # espera antes de tentar reconectar (dobra a cada falha)
+RETRY_MAX_S = 30.0
+SEND_BATCH = 256        # adds enviados de uma vez (sem esperar cada resposta)
+
+
+class _Connection:
+    """
+    Uma conexão TCP com o servidor, aberta no primeiro pedido e reaproveitada.
+    Um pedido (ou lote) por vez, sob lock. O estado offline (quando tentar
+    reconectar) é do RemoteScoreManager e vale para as duas conexões.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.lock = threading.Lock()
+        self._sock = None
+        self._reader = None
+
+    def _connect(self):
+        if self._sock is not None:
+            return
+        owner = self.owner
+        if time.monotonic() < owner._offline_until:
+            raise OSError("leaderboard offline")
+        try:
+            sock = socket.create_connection(owner.address, timeout=owner.timeout)
+        except OSError:
+            owner._went_offline()
+            raise
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        owner._retry_s = RETRY_MIN_S
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    def request(self, requests):
+        """
+        Envia os pedidos de uma vez e espera todas as respostas; retorna as
+        respostas na ordem dos pedidos. Chamar com lock. OSError se a
+        conexão falhar (a conexão é descartada).
+        """
+        self._connect()
+        for request in requests:
+            request["id"] = next(self.owner._ids)
+        try:
+            self._sock.sendall(b"".join(json.dumps(r).encode("utf-8") + b"\n" for r in requests))
+            responses = {}
+            while len(responses) < len(requests):
+                line = self._reader.readline()
+                if not line:
+                    raise ConnectionError("conexão fechada pelo servidor")
+                response = json.loads(line)
+                responses[response.get("id")] = response
+        except (OSError, ValueError) as e:
+            self.close()
+            self.owner._went_offline()
+            raise OSError(f"leaderboard: {e}") from e
+        return [responses.get(r["id"], {"ok": False, "error": "sem resposta"}) for r in requests]
+
+
+class RemoteScoreManager:
+    """
+    Mesma interface do ScoreManager, mas falando com um code/score_server.py.
+    Duas conexões TCP, abertas no primeiro uso e reaproveitadas: uma da
+    thread de envio (os adds, que esperam o commit no servidor) e outra
+    para as leituras, que assim não ficam atrás de um lote em andamento.
+
+    add_score() só coloca o score numa fila local; uma thread envia a fila
+    em lotes e retira os scores confirmados. Sem servidor, a fila é gravada
+    em SCORE_QUEUE_FILE e reenviada quando a conexão voltar (inclusive numa
+    próxima execução do jogo). Cada score leva seu created_at, e o servidor
+    ignora um reenvio do mesmo score.
+
+    Leituras sem servidor não bloqueiam o jogo: scores_page devolve uma
+    página vazia e rank_for/player_summary devolvem None (depois de uma
+    falha, sem nova tentativa de conexão até o fim da espera de reconexão).
+    """
+
+    def __init__(self, address, queue_file=SCORE_QUEUE_FILE, timeout=2.0):
+        host, _, port = address.rpartition(":")
+        self.address = (host or "127.0.0.1", int(port))
+        self.queue_file = queue_file
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._offline_until = 0.0         # sem tentar conectar antes disso (monotonic)
+        self._retry_s = RETRY_MIN_S
+        self._writes = _Connection(self)  # só a thread de envio
+        self._reads = _Connection(self)   # scores_page, rank_for, player_summary
+
+        # scores ainda não confirmados pelo servidor (ordem FIFO)
+        self._queue = self._load_queue()
+        self._queue_cond = threading.Condition()
+        self._closed = False
+        self._sender = threading.Thread(target=self._send_loop, name="score-sender", daemon=True)
+        self._sender.start()
+
+    # --- conexão ---------------------------------------------------------
+    def _went_offline(self):
+        self._offline_until = time.monotonic() + self._retry_s
+        self._retry_s = min(self._retry_s * 2, RETRY_MAX_S)
+
+    def _call(self, request):
+        with self._reads.lock:
+            response = self._reads.request([request])[0]
+        if not response.get("ok"):
+            raise OSError(f"leaderboard: {response.get('error')}")
+        return response
+
+    # --- fila de envio ---------------------------------------------------
+    def _load_queue(self):
+        rows = []
+        try:
+            with open(self.queue_file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        r = json.loads(line)
+                        telemetry = r[4] if len(r) > 4 else None
+                        rows.append((str(r[0]), int(r[1]), float(r[2]), str(r[3]), telemetry))
+                    except (ValueError, TypeError, IndexError):
+                        pass  # linha corrompida (ex.: gravação interrompida)
+        except OSError:
+            pass  # sem fila salva
+        return rows
+
+    def _save_queue(self):
+        """
+        Regrava o arquivo da fila com os scores ainda não enviados (ou o apaga).
+        """
+        with self._queue_cond:
+            rows = list(self._queue)
+        try:
+            if not rows:
+                if os.path.exists(self.queue_file):
+                    os.remove(self.queue_file)
+                return
+            tmp = self.queue_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+            os.replace(tmp, self.queue_file)
+        except OSError as e:
+            print(f"[score_client] falha ao salvar a fila offline: {e}", file=sys.stderr)
+
+    def add_score(self, player_name: str, points: int, play_time_seconds: float, created_at=None,
+                  telemetry=None):
+        """
+        Enfileira o score para envio em segundo plano (não bloqueia).
+        telemetry: BLOB da partida, enviado (e guardado na fila) em base64.
+        """
+        if self._closed:
+            raise RuntimeError("RemoteScoreManager já foi fechado")
+        if created_at is None:
+            created_at = datetime.datetime.utcnow().isoformat()
+        with self._queue_cond:
+            if telemetry is not None:
+                telemetry = base64.b64encode(telemetry).decode("ascii")
+            self._queue.append((player_name, points, play_time_seconds, created_at, telemetry))
+            self._queue_cond.notify_all()
+
+    def _send_loop(self):
+        saved = bool(self._queue)  # fila veio do arquivo
+        while True:
+            with self._queue_cond:
+                self._queue_cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    break
+                batch = self._queue[:SEND_BATCH]
+            if self._send_batch(batch):
+                if saved and not self._queue:
+                    self._save_queue()  # tudo enviado: apaga o arquivo
+                    saved = False
+                continue
+            # sem servidor: guarda a fila em disco e espera para tentar de novo
+            self._save_queue()
+            saved = True
+            with self._queue_cond:
+                if self._closed:
+                    break
+                self._queue_cond.wait(max(0.0, self._offline_until - time.monotonic()))
+
+    def _send_batch(self, batch):
+        requests = []
+        for name, points, play_time_seconds, created_at, telemetry in batch:
+            request = {"op": "add", "player_name": name, "points": points,
+                       "play_time_seconds": play_time_seconds, "created_at": created_at}
+            if telemetry is not None:
+                request["telemetry"] = telemetry
+            requests.append(request)
+        with self._writes.lock:
+            try:
+                responses = self._writes.request(requests)
+            except OSError:
+                return False
+        with self._queue_cond:
+            del self._queue[:len(batch)]
+            self._queue_cond.notify_all()
+        failed = [r.get("error") for r in responses if not r.get("ok")]
+        if failed:
+            # recusado pelo servidor (ex.: erro de gravação): não adianta reenviar
+            print(f"[score_client] {len(failed)} score(s) recusado(s): {failed[0]}", file=sys.stderr)
+        return True
+
+    def flush(self, timeout=None):
+        """
+        Espera até a fila ser enviada. Retorna False se o timeout (s) acabar antes.
+        """
+        with self._queue_cond:
+            return self._queue_cond.wait_for(lambda: not self._queue, timeout)
+
+    def close(self, timeout=3.0):
+        """
+        Tenta enviar o que falta por até 'timeout' s; o resto fica em SCORE_QUEUE_FILE.
+        """
+        if self._closed:
+            return
+        if time.monotonic() >= self._offline_until:
+            self.flush(timeout)  # offline: não adianta esperar
+        with self._queue_cond:
+            self._closed = True
+            self._queue_cond.notify_all()
+        self._offline_until = float("inf")  # o envio em andamento não reconecta
+        with self._writes.lock:
+            self._writes.close()
+        self._sender.join(timeout)
+        with self._reads.lock:
+            self._reads.close()
+        self._save_queue()
+
+    # --- leituras --------------------------------------------------------
+    def top_scores(self, limit=10):
+        rows, _ = self.scores_page(limit)
+        return rows
+
+    def scores_page(self, limit=10, after=None):
+        """
+        Mesma paginação por cursor do ScoreManager.scores_page.
+        """
+        try:
+            response = self._call({"op": "page", "limit": limit, "after": list(after) if after else None})
+        except OSError:
+            return [], None
+        cursor = response.get("cursor")
+        return [tuple(r) for r in response["rows"]], tuple(cursor) if cursor else None
+
+    def _queued(self):
+        with self._queue_cond:
+            return list(self._queue)
+
+    def rank_for(self, points, play_time_seconds):
+        """
+        Como ScoreManager.rank_for, contando também os scores na fila local.
+        """
+        try:
+            response = self._call({"op": "rank", "points": points, "play_time_seconds": play_time_seconds})
+        except OSError:
+            return None
+        # fila lida depois da resposta: um score do lote em voo pode ser contado
+        # duas vezes se o servidor acabou de gravá-lo (janela de uma ida e volta)
+        queued = self._queued()
+        ahead, total = response["rank"]
+        for _, p, t, _, _ in queued:
+            if p > points or (p == points and t >= play_time_seconds):
+                ahead += 1
+        return ahead, total + len(queued)
+
+    def player_summary(self, player_name):
+        """
+        Como ScoreManager.player_summary, contando também os scores na fila local.
+        """
+        try:
+            response = self._call({"op": "summary", "player_name": player_name})
+        except OSError:
+            return None
+        queued = [r for r in self._queued() if r[0] == player_name]
+        summary = response["summary"] or {"matches": 0, "best": None, "average": 0.0}
+        matches, total, best = summary["matches"], summary["average"] * summary["matches"], summary["best"]
+        for _, points, _, _, _ in queued:
+            matches += 1
+            total += points
+            best = points if best is None else max(best, points)
+        if not matches:
+            return None
+        return {"matches": matches, "best": best, "average": total / matches}
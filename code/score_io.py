@@ -0,0 +1,186 @@
+# score_io.py
+"""
+Exportação/importação da tabela scores em CSV ou JSONL, em streaming
+(memória constante, serve para arquivos com milhões de linhas). Uso:
+  python -m code.score_io export backup.csv
+  python -m code.score_io import backup.jsonl --db outro.db
+O formato vem da extensão (.csv / .jsonl) ou de --format.
+
+A importação deduplica pela chave natural
+(player_name, points, play_time_seconds, created_at): linhas que já existem
+no banco (ou que se repetem no próprio arquivo) são ignoradas. Os ids do
+arquivo não são usados; o banco de destino gera os seus.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from code.settings import DB_FILE
+from code.score_manager import ensure_schema
+
+COLUMNS = ("id", "player_name", "points", "play_time_seconds", "created_at")
+
+_INSERT_NEW = """
+    INSERT INTO scores (player_name, points, play_time_seconds, created_at)
+    SELECT ?, ?, ?, ?
+    WHERE NOT EXISTS (
+        SELECT 1 FROM scores
+        WHERE player_name = ? AND points = ? AND play_time_seconds = ? AND created_at = ?
+    )
+"""
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # cache de páginas maior (64 MB): os índices crescem em ordem aleatória na importação
+    conn.execute("PRAGMA cache_size=-65536")
+    return conn
+
+
+def _format_for(path, fmt):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"não sei o formato de {path!r}: use --format csv|jsonl")
+
+
+def export_scores(db_path, path, fmt=None, fetch_size=5000):
+    """
+    Grava todos os scores (ordem de id) em 'path'. Lê do cursor em blocos de
+    fetch_size linhas. Retorna (linhas, segundos).
+    """
+    fmt = _format_for(path, fmt)
+    t0 = time.perf_counter()
+    conn = _connect(db_path)
+    count = 0
+    try:
+        ensure_schema(conn)
+        cursor = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM scores ORDER BY id")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(COLUMNS)
+                write = writer.writerows
+            else:
+                write = lambda rows: f.writelines(
+                    json.dumps(dict(zip(COLUMNS, r)), ensure_ascii=False) + "\n" for r in rows)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                write(rows)
+                count += len(rows)
+    finally:
+        conn.close()
+    return count, time.perf_counter() - t0
+
+
+def _read_rows(path, fmt, errors):
+    """
+    Gera (player_name, points, play_time_seconds, created_at) do arquivo.
+    Linhas inválidas são contadas em errors[0] e puladas.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        records = csv.DictReader(f) if fmt == "csv" else f
+        for r in records:
+            if fmt == "jsonl":
+                if not r.strip():
+                    continue
+                try:
+                    r = json.loads(r)
+                except ValueError:
+                    errors[0] += 1  # linha JSON malformada
+                    continue
+            try:
+                yield (str(r["player_name"]), int(r["points"]), float(r["play_time_seconds"]),
+                       str(r["created_at"]))
+            except (KeyError, TypeError, ValueError):
+                errors[0] += 1
+
+
+def import_scores(db_path, path, fmt=None, chunk_size=5000, progress=None):
+    """
+    Importa 'path' em blocos de chunk_size linhas, um executemany por
+    transação. Retorna {"read", "inserted", "duplicates", "errors", "seconds", "rows_per_sec"}.
+    progress(read, inserted): chamado a cada bloco.
+    """
+    fmt = _format_for(path, fmt)
+    t0 = time.perf_counter()
+    conn = _connect(db_path)
+    errors = [0]
+    read = inserted = 0
+    try:
+        ensure_schema(conn)
+        chunk = []
+        for row in _read_rows(path, fmt, errors):
+            chunk.append(row + row)  # valores do INSERT + chave do NOT EXISTS
+            if len(chunk) >= chunk_size:
+                inserted += _insert_chunk(conn, chunk)
+                read += len(chunk)
+                chunk = []
+                if progress:
+                    progress(read, inserted)
+        if chunk:
+            inserted += _insert_chunk(conn, chunk)
+            read += len(chunk)
+            if progress:
+                progress(read, inserted)
+    finally:
+        conn.close()
+    seconds = time.perf_counter() - t0
+    return {
+        "read": read,
+        "inserted": inserted,
+        "duplicates": read - inserted,
+        "errors": errors[0],
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(read / seconds) if seconds > 0 else 0,
+    }
+
+
+def _insert_chunk(conn, chunk):
+    # rowcount soma só as linhas do INSERT; total_changes contaria também as
+    # escritas dos triggers (player_stats, score_counts)
+    with conn:
+        return conn.executemany(_INSERT_NEW, chunk).rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta/importa scores em CSV ou JSONL")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="arquivo .csv ou .jsonl")
+    parser.add_argument("--db", default=DB_FILE, help="banco de scores (padrão: o do jogo)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default=None)
+    parser.add_argument("--batch", type=int, default=5000,
+                        help="linhas por fetchmany (export) ou por transação (import)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "export":
+            count, seconds = export_scores(args.db, args.path, args.format, args.batch)
+            print(f"{count} linhas exportadas em {seconds:.2f}s ({count / max(seconds, 1e-9):.0f} linhas/s)")
+        else:
+            def progress(read, inserted):
+                print(f"\r{read} lidas, {inserted} inseridas", end="", file=sys.stderr, flush=True)
+            result = import_scores(args.db, args.path, args.format, args.batch, progress)
+            print(file=sys.stderr)
+            print(f"{result['read']} lidas, {result['inserted']} inseridas, {result['duplicates']} duplicadas, "
+                  f"{result['errors']} inválidas em {result['seconds']:.2f}s ({result['rows_per_sec']} linhas/s)")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# score_loadtest.py
+"""
+Teste de carga do servidor de leaderboard (code/score_server.py): várias
+conexões simultâneas enviando adds, cada uma com até --depth pedidos em voo.
+Sem --server, sobe um servidor num subprocesso com um banco temporário. Uso:
+  python -m code.score_loadtest --clients 32 --depth 8 --submissions 20000
+  python -m code.score_loadtest --server 192.168.0.10:8765 --reads 1
+Contra um --server de verdade os adds viram scores "LOADnnn" no leaderboard
+dele: só com --allow-writes (senão use --reads 1, só leituras).
+Mostra adds/s confirmados (commitados) e a latência por pedido.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from code.settings import BASE_DIR
+
+
+async def _client(host, port, count, depth, reads, rng, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = {}           # id -> (instante do envio, é leitura)
+    next_id = 0
+    done = 0
+    in_flight = asyncio.Semaphore(depth)
+
+    async def receive():
+        nonlocal done
+        while done < count:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("servidor fechou a conexão")
+            response = json.loads(line)
+            t0, is_read = sent.pop(response["id"])
+            latencies["read" if is_read else "add"].append(time.perf_counter() - t0)
+            if not response.get("ok"):
+                errors.append(response.get("error"))
+            done += 1
+            in_flight.release()
+
+    receiver = asyncio.create_task(receive())
+    for _ in range(count):
+        await in_flight.acquire()
+        next_id += 1
+        if rng.random() < reads:
+            request = {"op": "page", "limit": 10}
+        else:
+            request = {"op": "add", "player_name": f"LOAD{rng.randrange(1000)}",
+                       "points": rng.randrange(0, 2000, 10),
+                       "play_time_seconds": round(rng.uniform(5, 120), 3)}
+        request["id"] = next_id
+        sent[next_id] = (time.perf_counter(), "player_name" not in request)
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+
+
+def _summary(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    pick = lambda q: round(values[min(len(values) - 1, int(q * len(values)))] * 1000.0, 2)
+    return {"n": len(values), "p50_ms": pick(0.50), "p95_ms": pick(0.95),
+            "p99_ms": pick(0.99), "max_ms": round(values[-1] * 1000.0, 2)}
+
+
+async def run_load(host, port, clients, depth, submissions, reads, seed=0):
+    latencies = {"add": [], "read": []}
+    errors = []
+    per_client = [submissions // clients + (i < submissions % clients) for i in range(clients)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, n, depth, reads, random.Random(seed * 7919 + i),
+                                   latencies, errors)
+                           for i, n in enumerate(per_client) if n))
+    elapsed = time.perf_counter() - t0
+    adds = len(latencies["add"])
+    return {
+        "clients": clients,
+        "depth": depth,
+        "seconds": round(elapsed, 3),
+        "adds_per_sec": round(adds / elapsed, 1),
+        "requests_per_sec": round((adds + len(latencies["read"])) / elapsed, 1),
+        "add_latency": _summary(latencies["add"]),
+        "read_latency": _summary(latencies["read"]),
+        "errors": len(errors),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(db_path):
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "code.score_server", "--port", str(port), "--db", db_path],
+                            cwd=BASE_DIR, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, port
+        except OSError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("servidor de teste não subiu")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do leaderboard")
+    parser.add_argument("--server", default=None, help="host:porta (padrão: servidor temporário)")
+    parser.add_argument("--clients", type=int, default=32, help="conexões simultâneas")
+    parser.add_argument("--depth", type=int, default=8, help="pedidos em voo por conexão")
+    parser.add_argument("--submissions", type=int, default=20000, help="pedidos no total")
+    parser.add_argument("--reads", type=float, default=0.0, help="fração de pedidos que são leituras do top 10")
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="com --server: permite gravar scores de teste nesse leaderboard")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.server and args.reads < 1.0 and not args.allow_writes:
+        parser.error("--server gravaria scores LOADnnn no leaderboard real: use --reads 1 ou --allow-writes")
+
+    proc = None
+    tmp_dir = None
+    if args.server:
+        host, _, port = args.server.rpartition(":")
+        host, port = host or "127.0.0.1", int(port)
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        proc, port = _start_server(os.path.join(tmp_dir.name, "load.db"))
+        host = "127.0.0.1"
+    try:
+        result = asyncio.run(run_load(host, port, args.clients, args.depth, args.submissions,
+                                      args.reads, args.seed))
+    except (OSError, RuntimeError) as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(10)
+        if tmp_dir:
+            tmp_dir.cleanup()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,114 @@
 # score_manager.py
 import sqlite3
 import datetime
-from code.settings import DB_FILE
+import sys
+import threading
+import queue
+from collections import deque
+from bisect import bisect_right
+from code.settings import DB_FILE, SCORE_SERVER
 
-class ScoreManager:
+_STOP = object()  # sinal de parada para a thread de escrita
+
+# Migrações do schema, aplicadas em ordem conforme PRAGMA user_version.
+# Nunca altere uma migração existente: adicione uma nova ao final.
+_MIGRATIONS = [
+    # 1: índice de cobertura na ordem do ranking (top N e paginação sem scan/sort)
     """
-    Gerencia armazenamento e leitura de scores em SQLite.
-    Tabela: scores (id, player_name, points, play_time_seconds, created_at)
+    CREATE INDEX IF NOT EXISTS idx_scores_rank
+    ON scores (points DESC, play_time_seconds DESC, id, player_name, created_at)
+    """,
+    # 2: chave natural de um score, usada para deduplicar importações (code/score_io.py)
     """
+    CREATE INDEX IF NOT EXISTS idx_scores_natural
+    ON scores (player_name, points, play_time_seconds, created_at)
+    """,
+    # 3: resumos materializados, mantidos por triggers na mesma transação do INSERT:
+    #    player_stats (recorde/soma/partidas por jogador) e score_counts (scores por
+    #    pontuação, para calcular a posição no ranking sem percorrer a tabela)
+    (
+        """
+        CREATE TABLE IF NOT EXISTS player_stats (
+            player_name TEXT PRIMARY KEY,
+            matches INTEGER NOT NULL,
+            total_points INTEGER NOT NULL,
+            best_points INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS score_counts (
+            points INTEGER PRIMARY KEY,
+            n INTEGER NOT NULL
+        )
+        """,
+        """
+        INSERT INTO player_stats (player_name, matches, total_points, best_points)
+        SELECT player_name, COUNT(*), SUM(points), MAX(points) FROM scores GROUP BY player_name
+        """,
+        """
+        INSERT INTO score_counts (points, n)
+        SELECT points, COUNT(*) FROM scores GROUP BY points
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_scores_insert AFTER INSERT ON scores
+        BEGIN
+            INSERT INTO player_stats (player_name, matches, total_points, best_points)
+            VALUES (new.player_name, 1, new.points, new.points)
+            ON CONFLICT (player_name) DO UPDATE SET
+                matches = matches + 1,
+                total_points = total_points + excluded.total_points,
+                best_points = MAX(best_points, excluded.best_points);
+            INSERT INTO score_counts (points, n) VALUES (new.points, 1)
+            ON CONFLICT (points) DO UPDATE SET n = n + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_scores_delete AFTER DELETE ON scores
+        BEGIN
+            UPDATE player_stats SET
+                matches = matches - 1,
+                total_points = total_points - old.points,
+                best_points = COALESCE(
+                    (SELECT MAX(points) FROM scores WHERE player_name = old.player_name), 0)
+            WHERE player_name = old.player_name;
+            DELETE FROM player_stats WHERE player_name = old.player_name AND matches <= 0;
+            UPDATE score_counts SET n = n - 1 WHERE points = old.points;
+            DELETE FROM score_counts WHERE points = old.points AND n <= 0;
+        END
+        """,
+    ),
+    # 4: telemetria por alvo de cada partida, um BLOB compacto por score (code/telemetry.py);
+    #    o trigger apaga a telemetria junto com o score (foreign_keys fica desligado)
+    (
+        """
+        CREATE TABLE IF NOT EXISTS match_telemetry (
+            score_id INTEGER PRIMARY KEY,
+            data BLOB NOT NULL
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_scores_delete_telemetry AFTER DELETE ON scores
+        BEGIN
+            DELETE FROM match_telemetry WHERE score_id = old.id;
+        END
+        """,
+    ),
+]
 
-    def __init__(self, db_path=DB_FILE):
-        self.db_path = db_path
-        self._ensure_table()
+# ordem total do ranking; id desempata (score mais antigo fica à frente)
+_RANK_ORDER = "points DESC, play_time_seconds DESC, id ASC"
 
-    def _ensure_table(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""
+
+def _rank_key(points, play_time_seconds, score_id):
+    return (-points, -play_time_seconds, score_id)
+
+
+def ensure_schema(conn):
+    """
+    Cria a tabela scores (se preciso) e aplica as migrações pendentes.
+    """
+    with conn:
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS scores (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 player_name TEXT NOT NULL,
@@ -25,28 +117,407 @@ class ScoreManager:
                 created_at TEXT NOT NULL
             )
         """)
-        conn.commit()
-        conn.close()
-
-    def add_score(self, player_name: str, points: int, play_time_seconds: float):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""
-            INSERT INTO scores (player_name, points, play_time_seconds, created_at)
-            VALUES (?, ?, ?, ?)
-        """, (player_name, points, play_time_seconds, datetime.datetime.utcnow().isoformat()))
-        conn.commit()
-        conn.close()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, migration in enumerate(_MIGRATIONS[version:], start=version + 1):
+        # uma migração é uma instrução ou uma tupla delas, aplicadas numa única transação
+        statements = (migration,) if isinstance(migration, str) else migration
+        with conn:
+            # IMMEDIATE trava a escrita antes de reler a versão: se outro processo
+            # (jogo, score_server, outro gabinete) migrou enquanto esperávamos, pula
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= target:
+                continue
+            for sql in statements:
+                conn.execute(sql)
+            # PRAGMA não aceita parâmetros; target é sempre int
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+
+
+class ScoreManager:
+    """
+    Gerencia armazenamento e leitura de scores em SQLite.
+    Tabela: scores (id, player_name, points, play_time_seconds, created_at)
+    Índices: idx_scores_rank, na ordem do ranking, e idx_scores_natural
+    (chave natural, para importação), criados por migração
+    Resumos: player_stats e score_counts, mantidos por triggers
+    Telemetria: match_telemetry (score_id, data), opcional por score
+
+    O banco fica em modo WAL com conexões de vida longa: uma para leitura
+    (thread principal) e outra da thread de escrita. add_score() só enfileira
+    a linha; a thread de escrita agrupa o que estiver na fila numa única
+    transação, então gravar um score nunca bloqueia um quadro. flush() espera
+    as gravações pendentes e close() deve ser chamado ao encerrar o jogo.
+
+    Os top_cache_size primeiros do ranking ficam em memória. A thread de
+    escrita insere nesse cache as linhas recém-commitadas que entram no top;
+    gravações de outros processos são detectadas pelo MAX(id) e recarregam o cache.
+    """
+
+    def __init__(self, db_path=DB_FILE, batch_size=256, top_cache_size=100):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._conn = self._connect()
+        self._read_lock = threading.Lock()
+        self._ensure_table()
+
+        self.top_cache_size = top_cache_size
+        self._cache_lock = threading.Lock()
+        self._top_keys = None   # chaves de ordenação (None = cache não carregado)
+        self._top_rows = None   # (player_name, points, play_time_seconds, created_at, id)
+        self._top_max_id = 0    # maior id já refletido no cache
+
+        # linhas aceitas por add_score() e ainda não commitadas (ordem FIFO)
+        self._pending = []
+        self._pending_cond = threading.Condition()
+        self._commits = 0         # lotes já commitados e removidos de _pending
+        self._enqueued = 0        # linhas aceitas por add_score (número de sequência)
+        self._processed = 0       # linhas que a thread de escrita já tentou gravar
+        self._failed = deque(maxlen=64)  # (primeira, última) sequência de lotes perdidos
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+        self._writer.start()
+        self._closed = False
+
+    def _connect(self):
+        # timeout: espera (em s) se outra sessão estiver escrevendo no mesmo arquivo
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_table(self):
+        ensure_schema(self._conn)
+
+    def add_score(self, player_name: str, points: int, play_time_seconds: float, created_at=None,
+                  telemetry=None):
+        """
+        Enfileira o score para gravação em segundo plano (não bloqueia).
+        created_at: horário original (ISO, UTC) de um score vindo de outro
+        lugar; padrão é agora. telemetry: BLOB da partida
+        (MatchTelemetry.pack()), gravado na mesma transação e ligado ao id do
+        score. Retorna o número de sequência da linha (ver wait_written).
+        """
+        if self._closed:
+            raise RuntimeError("ScoreManager já foi fechado")
+        if created_at is None:
+            created_at = datetime.datetime.utcnow().isoformat()
+        row = (player_name, points, play_time_seconds, created_at)
+        with self._pending_cond:
+            self._pending.append(row)
+            self._enqueued += 1
+            seq = self._enqueued
+        self._queue.put((row, telemetry))
+        return seq
+
+    def wait_written(self, seq, timeout=None):
+        """
+        Espera a thread de escrita processar a linha 'seq' (de add_score).
+        Retorna True se ela foi commitada, False se a gravação falhou ou o
+        timeout (s) acabou antes.
+        """
+        with self._pending_cond:
+            if not self._pending_cond.wait_for(lambda: self._processed >= seq, timeout):
+                return False
+            return not any(first <= seq <= last for first, last in self._failed)
+
+    def has_score(self, player_name, points, play_time_seconds, created_at):
+        """
+        True se um score com essa chave natural já está gravado (idx_scores_natural).
+        """
+        return bool(self._read("""
+            SELECT 1 FROM scores
+            WHERE player_name = ? AND points = ? AND play_time_seconds = ? AND created_at = ?
+            LIMIT 1
+        """, (player_name, points, play_time_seconds, created_at)))
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch = [item]
+                # agrupa tudo o que já estiver na fila numa única transação
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, batch, attempts=3):
+        rows = [row for row, _ in batch]
+        for attempt in range(attempts):
+            try:
+                ids = self._insert_rows(conn, rows)
+                conn.executemany("INSERT INTO match_telemetry (score_id, data) VALUES (?, ?)",
+                                 [(score_id, telemetry) for score_id, (_, telemetry) in zip(ids, batch)
+                                  if telemetry is not None])
+                # a espera por lock (busy) fica nos INSERTs acima; o COMMIT e a
+                # remoção de _pending acontecem juntos sob o lock, então um leitor
+                # nunca vê a mesma linha no banco e em _pending (_read_with_pending)
+                with self._pending_cond:
+                    conn.commit()
+                    self._batch_done(len(batch), True)
+                self._cache_insert(rows, ids)
+                return
+            except sqlite3.Error as e:
+                conn.rollback()
+                if attempt == attempts - 1:
+                    print(f"[score_manager] falha ao gravar {len(batch)} score(s): {e}", file=sys.stderr)
+        with self._pending_cond:
+            self._batch_done(len(batch), False)
+
+    def _batch_done(self, n, written):
+        # chamar com _pending_cond
+        del self._pending[:n]
+        if not written:
+            self._failed.append((self._processed + 1, self._processed + n))
+        self._processed += n
+        self._commits += 1
+        self._pending_cond.notify_all()
+
+    def _insert_rows(self, conn, rows):
+        """
+        Insere as linhas na transação corrente e retorna os ids gerados.
+        """
+        ids = []
+        for row in rows:
+            cur = conn.execute("""
+                INSERT INTO scores (player_name, points, play_time_seconds, created_at)
+                VALUES (?, ?, ?, ?)
+            """, row)
+            ids.append(cur.lastrowid)
+        return ids
+
+    def _cache_insert(self, rows, ids):
+        """
+        Atualiza o cache do top N com linhas já commitadas (thread de escrita).
+        """
+        with self._cache_lock:
+            if self._top_keys is None:
+                return
+            keys, cached = self._top_keys, self._top_rows
+            cached_ids = {r[4] for r in cached}
+            for (player_name, points, play_time_seconds, created_at), score_id in zip(rows, ids):
+                if score_id <= self._top_max_id or score_id in cached_ids:
+                    continue  # o cache já foi recarregado com esta linha
+                if score_id != self._top_max_id + 1:
+                    # outro processo gravou no meio: recarrega na próxima leitura
+                    self._top_keys = self._top_rows = None
+                    return
+                self._top_max_id = score_id
+                key = _rank_key(points, play_time_seconds, score_id)
+                if len(keys) >= self.top_cache_size and key > keys[-1]:
+                    continue  # não entra no top
+                i = bisect_right(keys, key)
+                keys.insert(i, key)
+                cached.insert(i, (player_name, points, play_time_seconds, created_at, score_id))
+                if len(keys) > self.top_cache_size:
+                    keys.pop()
+                    cached.pop()
+
+    def flush(self, timeout=None):
+        """
+        Espera até todas as linhas enfileiradas serem commitadas.
+        Retorna False se o timeout (s) acabar antes.
+        """
+        with self._pending_cond:
+            return self._pending_cond.wait_for(lambda: not self._pending, timeout)
+
+    def close(self, timeout=10.0):
+        """
+        Grava o que estiver pendente, encerra a thread de escrita e fecha as conexões.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+        with self._read_lock:
+            self._conn.close()
+
+    def _read(self, sql, params=()):
+        # uma única instrução SELECT já lê um snapshot consistente em WAL
+        with self._read_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _read_snapshot(self, queries):
+        """
+        Executa [(sql, params), ...] numa única transação de leitura: todas as
+        instruções veem o mesmo snapshot, mesmo que a thread de escrita
+        commite no meio. Retorna a lista de resultados.
+        """
+        with self._read_lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                return [conn.execute(sql, params).fetchall() for sql, params in queries]
+            finally:
+                conn.commit()
+
+    def _fresh_top_cache(self):
+        """
+        Garante que o cache do top N reflete o banco; recarrega se outro
+        processo gravou (MAX(id) maior que o conhecido). Chamar com _cache_lock.
+        """
+        max_id = self._read("SELECT MAX(id) FROM scores")[0][0] or 0
+        if self._top_keys is None or max_id > self._top_max_id:
+            # MAX(id) relido no mesmo snapshot das linhas: um lote commitado
+            # entre as duas leituras não entra no cache sem entrar em _top_max_id
+            (max_row,), rows = self._read_snapshot([
+                ("SELECT MAX(id) FROM scores", ()),
+                (f"""
+                    SELECT player_name, points, play_time_seconds, created_at, id
+                    FROM scores
+                    ORDER BY {_RANK_ORDER}
+                    LIMIT ?
+                """, (self.top_cache_size,)),
+            ])
+            max_id = max_row[0] or 0
+            self._top_rows = rows
+            self._top_keys = [_rank_key(r[1], r[2], r[4]) for r in rows]
+            self._top_max_id = max_id
+        return self._top_keys, self._top_rows
 
     def top_scores(self, limit=10):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("""
-            SELECT player_name, points, play_time_seconds, created_at
-            FROM scores
-            ORDER BY points DESC, play_time_seconds DESC
-            LIMIT ?
-        """, (limit,))
-        rows = c.fetchall()
-        conn.close()
+        rows, _ = self.scores_page(limit)
         return rows
+
+    def scores_page(self, limit=10, after=None):
+        """
+        Paginação por chave (keyset): retorna (linhas, cursor). 'after' é o
+        cursor devolvido pela página anterior (None = início do ranking) e o
+        cursor retornado é None quando não há mais linhas.
+        Linhas: (player_name, points, play_time_seconds, created_at).
+        """
+        with self._cache_lock:
+            keys, cached = self._fresh_top_cache()
+            start = 0 if after is None else bisect_right(keys, _rank_key(*after))
+            complete = len(cached) < self.top_cache_size  # cache contém a tabela toda
+            if start + limit < len(cached) or complete:
+                page = cached[start:start + limit + 1]
+                return self._page_result(page, limit)
+
+        # fora do cache: busca pelo índice a partir do cursor, sem OFFSET
+        if after is None:
+            page = self._read(f"""
+                SELECT player_name, points, play_time_seconds, created_at, id
+                FROM scores
+                ORDER BY {_RANK_ORDER}
+                LIMIT ?
+            """, (limit + 1,))
+        else:
+            points, play_time_seconds, score_id = after
+            page = self._read(f"""
+                SELECT player_name, points, play_time_seconds, created_at, id
+                FROM scores
+                WHERE points <= ?
+                  AND (points < ? OR play_time_seconds < ? OR (play_time_seconds = ? AND id > ?))
+                ORDER BY {_RANK_ORDER}
+                LIMIT ?
+            """, (points, points, play_time_seconds, play_time_seconds, score_id, limit + 1))
+        return self._page_result(page, limit)
+
+    def _read_with_pending(self, read):
+        """
+        Executa read() no banco e devolve (resultado, linhas de _pending), de
+        forma que cada score entre exatamente uma vez: se a thread de escrita
+        commitou durante a leitura, lê de novo. Não espera a gravação em
+        andamento (o commit e a remoção de _pending são atômicos sob o lock).
+        """
+        cond = self._pending_cond
+        while True:
+            with cond:
+                commits = self._commits
+                pending = list(self._pending)
+            result = read()
+            with cond:
+                if self._commits == commits:
+                    return result, pending
+
+    def player_summary(self, player_name):
+        """
+        {"matches", "best", "average"} do jogador, lidos de player_stats (uma
+        busca pela chave) mais os scores dele ainda na fila. None se não há scores.
+        """
+        rows, pending = self._read_with_pending(lambda: self._read(
+            "SELECT matches, total_points, best_points FROM player_stats WHERE player_name = ?",
+            (player_name,)))
+        matches, total, best = rows[0] if rows else (0, 0, None)
+        for name, points, _, _ in pending:
+            if name == player_name:
+                matches += 1
+                total += points
+                best = points if best is None else max(best, points)
+        if not matches:
+            return None
+        return {"matches": matches, "best": best, "average": total / matches}
+
+    def rank_for(self, points, play_time_seconds):
+        """
+        Posição (1 = primeiro) que um score novo com estes valores ocupa no
+        ranking, e o total de scores contando com ele: (posição, total).
+        Chame antes de add_score(): os empates já existentes ficam à frente.
+        As pontuações maiores são somadas em score_counts (uma linha por valor
+        de pontos); só os empates em pontos são contados no idx_scores_rank.
+        """
+        def read():
+            better = self._read(
+                "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE points > ?", (points,))[0][0]
+            tied = self._read(
+                "SELECT COUNT(*) FROM scores WHERE points = ? AND play_time_seconds >= ?",
+                (points, play_time_seconds))[0][0]
+            total = self._read("SELECT COALESCE(SUM(n), 0) FROM score_counts")[0][0]
+            return better + tied, total
+
+        (ahead, total), pending = self._read_with_pending(read)
+        for _, p, t, _ in pending:
+            if p > points or (p == points and t >= play_time_seconds):
+                ahead += 1
+        return ahead + 1, total + len(pending) + 1
+
+    @staticmethod
+    def _page_result(page, limit):
+        rows = [r[:4] for r in page[:limit]]
+        cursor = None
+        if len(page) > limit:
+            last = page[limit - 1]
+            cursor = (last[1], last[2], last[4])
+        return rows, cursor
+
+
+_shared = None
+
+
+def get_score_manager():
+    """
+    Retorna o ScoreManager compartilhado pelo processo (Menu, Game, ...).
+    Com SCORE_SERVER definido, é um RemoteScoreManager (leaderboard da rede).
+    """
+    global _shared
+    if _shared is None:
+        if SCORE_SERVER:
+            from code.score_client import RemoteScoreManager
+            _shared = RemoteScoreManager(SCORE_SERVER)
+        else:
+            _shared = ScoreManager()
+    return _shared
+
+
+def close_score_manager():
+    """
+    Grava os scores pendentes e fecha o ScoreManager compartilhado.
+    """
+    global _shared
+    if _shared is not None:
+        _shared.close()
+        _shared = None
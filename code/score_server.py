@@ -0,0 +1,221 @@
+# score_server.py
+"""
+Leaderboard compartilhado entre máquinas (ex.: vários gabinetes num mesmo
+local). Um processo guarda o banco e os jogos falam com ele por TCP. Uso:
+  python -m code.score_server --host 0.0.0.0 --port 8765
+e, em cada máquina, SCORE_SERVER = "ip:8765" em settings.py.
+
+Protocolo: um objeto JSON por linha, nos dois sentidos. Cada pedido leva um
+"id" que volta na resposta; um cliente pode mandar vários pedidos sem
+esperar as respostas (as respostas podem chegar fora de ordem).
+  {"id": 1, "op": "add", "player_name": "ANA", "points": 120,
+   "play_time_seconds": 41.5, "created_at": "2024-...",
+   "telemetry": "<base64 do BLOB, opcional>"}            -> {"id": 1, "ok": true}
+  {"id": 2, "op": "page", "limit": 10, "after": null}     -> {"id": 2, "ok": true, "rows": [...], "cursor": ...}
+  {"id": 3, "op": "rank", "points": 120, "play_time_seconds": 41.5} -> {..., "rank": [posição, total]}
+  {"id": 4, "op": "summary", "player_name": "ANA"}        -> {..., "summary": {...} | null}
+  {"id": 5, "op": "stats"}                                -> {..., "stats": {...}}
+Erros: {"id": n, "ok": false, "error": "..."}.
+
+"add" só responde depois do commit. Os adds de todas as conexões entram na
+fila do ScoreManager e a thread de escrita grava o que estiver na fila numa
+única transação: quanto mais pedidos simultâneos, maiores os lotes. Um add
+repetido (mesma chave natural, ex.: reenvio de um cliente que perdeu a
+resposta) é confirmado sem gravar de novo.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+
+from code.settings import DB_FILE, SCORE_SERVER_PORT
+from code.score_manager import ScoreManager
+
+MAX_LINE = 64 * 1024    # tamanho máximo de um pedido (bytes)
+MAX_PAGE = 100          # linhas por página
+PAGE_CACHE_TTL = 1.0    # s; o cache também cai a cada lote gravado por este servidor
+
+
+class ScoreServer:
+    """
+    Servidor asyncio sobre um ScoreManager. As leituras e a espera pelos
+    commits rodam no executor padrão, fora do loop de eventos.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._waiting = []        # (seq, future) de adds esperando o commit
+        self._wake = None
+        self._inflight = set()    # chaves naturais de adds ainda não confirmados
+        self._generation = 0      # lotes confirmados (invalida o cache de páginas)
+        self._page_cache = {}     # limit -> (geração, instante, resposta)
+        self.counters = {"connections": 0, "requests": 0, "adds": 0, "duplicates": 0,
+                         "errors": 0, "batches": 0, "page_cache_hits": 0}
+
+    async def start(self, host, port):
+        self._wake = asyncio.Event()
+        self._acker = asyncio.create_task(self._ack_loop())
+        return await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+
+    # --- commits ---------------------------------------------------------
+    async def _ack_loop(self):
+        """
+        Confirma os adds em grupo: espera o commit da linha mais nova da
+        fila e responde todos os que já foram processados até ela.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._waiting:
+                target = self._waiting[-1][0]
+                await loop.run_in_executor(None, self.manager.wait_written, target)
+                done = [w for w in self._waiting if w[0] <= target]
+                self._waiting = [w for w in self._waiting if w[0] > target]
+                for seq, future in done:
+                    if not future.done():
+                        future.set_result(self.manager.wait_written(seq, 0))
+                self._generation += 1
+                self.counters["batches"] += 1
+
+    # --- conexões --------------------------------------------------------
+    async def _handle(self, reader, writer):
+        self.counters["connections"] += 1
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # cada pedido numa task: adds de uma mesma conexão entram no mesmo lote
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, ValueError):
+            pass  # cliente caiu ou mandou linha grande demais
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def _respond(self, line, writer):
+        self.counters["requests"] += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = await self._dispatch(request)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            self.counters["errors"] += 1
+            response = {"ok": False, "error": f"pedido inválido: {e}"}
+        response["id"] = request_id
+        try:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _dispatch(self, request):
+        op = request["op"]
+        if op == "add":
+            return await self._add(request)
+        if op == "page":
+            return await self._page(int(request.get("limit", 10)), request.get("after"))
+        if op == "rank":
+            rank = await self._run(self.manager.rank_for, int(request["points"]),
+                                   float(request["play_time_seconds"]))
+            return {"ok": True, "rank": list(rank)}
+        if op == "summary":
+            summary = await self._run(self.manager.player_summary, str(request["player_name"]))
+            return {"ok": True, "summary": summary}
+        if op == "stats":
+            return {"ok": True, "stats": dict(self.counters, waiting=len(self._waiting))}
+        raise ValueError(f"op desconhecida: {op!r}")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _add(self, request):
+        player_name = str(request["player_name"])
+        points = int(request["points"])
+        play_time_seconds = float(request["play_time_seconds"])
+        created_at = request.get("created_at")
+        telemetry = request.get("telemetry")
+        if telemetry is not None:
+            telemetry = base64.b64decode(telemetry, validate=True)
+        key = None
+        if created_at is not None:
+            created_at = str(created_at)
+            key = (player_name, points, play_time_seconds, created_at)
+            exists = await self._run(self.manager.has_score, *key)
+            # checa os em voo depois do await: outro pedido igual pode ter entrado nesse meio tempo
+            if exists or key in self._inflight:
+                self.counters["duplicates"] += 1
+                return {"ok": True, "duplicate": True}
+            self._inflight.add(key)
+        try:
+            seq = self.manager.add_score(player_name, points, play_time_seconds, created_at, telemetry)
+            future = asyncio.get_running_loop().create_future()
+            self._waiting.append((seq, future))
+            self._wake.set()
+            written = await future
+        finally:
+            self._inflight.discard(key)
+        if not written:
+            self.counters["errors"] += 1
+            return {"ok": False, "error": "falha ao gravar o score"}
+        self.counters["adds"] += 1
+        return {"ok": True}
+
+    async def _page(self, limit, after):
+        limit = max(1, min(limit, MAX_PAGE))
+        if after is None:
+            # primeira página (top N): resposta pronta enquanto nada for gravado
+            cached = self._page_cache.get(limit)
+            now = time.monotonic()
+            if cached and cached[0] == self._generation and now - cached[1] < PAGE_CACHE_TTL:
+                self.counters["page_cache_hits"] += 1
+                return cached[2]
+            generation = self._generation
+            response = await self._fetch_page(limit, None)
+            self._page_cache[limit] = (generation, now, response)
+            return response
+        return await self._fetch_page(limit, tuple(after))
+
+    async def _fetch_page(self, limit, after):
+        rows, cursor = await self._run(self.manager.scores_page, limit, after)
+        return {"ok": True, "rows": [list(r) for r in rows],
+                "cursor": list(cursor) if cursor else None}
+
+
+async def serve(host, port, db_path):
+    manager = ScoreManager(db_path)
+    server = ScoreServer(manager)
+    try:
+        listener = await server.start(host, port)
+        addresses = ", ".join(f"{s.getsockname()[0]}:{s.getsockname()[1]}" for s in listener.sockets)
+        print(f"leaderboard em {addresses} (banco: {db_path})", flush=True)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        manager.close()
+        print(f"encerrado: {server.counters}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de leaderboard do Speed Of Light")
+    parser.add_argument("--host", default="127.0.0.1", help="0.0.0.0 para aceitar conexões da rede")
+    parser.add_argument("--port", type=int, default=SCORE_SERVER_PORT)
+    parser.add_argument("--db", default=DB_FILE, help="banco de scores (padrão: o do jogo)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.db))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
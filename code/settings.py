@@ -11,6 +11,37 @@ WIDTH = 720
 HEIGHT = 480
 FPS = 60
 
+# Loop: simulação em passo fixo, renderização em taxa variável
+SIM_HZ = 120            # passos de simulação por segundo (independe do FPS)
+MAX_FRAME_MS = 250      # limite de catch-up: tempo máximo simulado por quadro
+RENDER_FPS_CAP = FPS    # limite de quadros desenhados na partida (0 = sem limite)
+VSYNC = False           # sincroniza com o monitor (usa pygame.SCALED)
+INTERPOLATE = True      # HUD usa o tempo acumulado ainda não simulado
+CLICK_ON_PRESS = True   # acerto conta ao apertar o botão (False = ao soltar)
+
+# Renderização
+DIRTY_RECTS = True      # envia só as áreas que mudaram (display.update(rects))
+DIRTY_MAX_RATIO = 0.5   # acima dessa fração da tela suja, usa flip() completo
+PRINT_STATS = False     # imprime estatísticas de render/caches ao fim das telas
+IDLE_RENDERING = True   # telas estáticas esperam eventos em vez de desenhar a FPS
+IDLE_TIMEOUT_MS = 500   # espera máxima por evento nessas telas
+BLITS_MERGE_OVER = 64   # renderer.blits: acima disso marca só a união das áreas
+
+# Efeitos de acerto (ver code/effects.py)
+HIT_EFFECTS = True
+PARTICLE_CAPACITY = 4096        # partículas vivas no máximo (pool pré-alocado)
+PARTICLES_PER_HIT = 24
+PARTICLE_LIFE_MS = 600
+PARTICLE_SPEED = 0.25           # px/ms no início
+PARTICLE_GRAVITY = 0.0006       # px/ms²
+POPUP_LIFE_MS = 700             # "+pontos" que sobe e some
+FADE_LEVELS = 8                 # quadros de opacidade pré-renderizados por sprite
+
+# Profiler por fase do quadro (F3 liga/desliga durante o jogo)
+PROFILE = False
+PROFILE_FRAMES = 1200   # tamanho dos buffers circulares (quadros)
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")  # CSV exportado ao fim da partida
+
 # Assets
 MENU_BG = os.path.join(ASSET_DIR, "image", "menu_bg.png")
 GAME_BG = os.path.join(ASSET_DIR, "image", "game_bg.png")
@@ -20,6 +51,18 @@ TARGET_SHADOW_IMG = os.path.join(ASSET_DIR, "image", "target_shadow.png")
 MENU_MUSIC = os.path.join(ASSET_DIR, "audio", "menu_music.mp3")
 GAME_MUSIC = os.path.join(ASSET_DIR, "audio", "game_music.mp3")
 
+# Áudio (ver code/audio.py)
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 512      # amostras por buffer do mixer (~12 ms a 44.1 kHz)
+SFX_CHANNELS = 8        # canais reservados para efeitos (acerto/erro)
+SFX_VOLUME = 0.8
+MUSIC_VOLUME = 0.6
+MUSIC_FADE_MS = 400     # crossfade ao trocar de música
+
+# Imagens já escaladas gravadas como pixels crus (ver code/baked_assets.py)
+BAKED_ASSETS = True
+BAKE_DIR = os.path.join(BASE_DIR, ".baked")
+
 
 
 # Gameplay
@@ -29,4 +72,20 @@ INITIAL_TARGET_ACTIVE_MS = 1500  # tempo que alvo fica ativo em ms (será reduzi
 INITIAL_WARNING_MS = 700        # tempo da sombra antes do alvo aparecer
 MIN_ACTIVE_MS = 400             # limite mínimo para o tempo ativo (dificuldade)
 SCORE_PER_HIT = 10
+ACTIVE_MS_STEP = 60             # quanto o tempo ativo diminui a cada acerto
+INITIAL_SPAWN_INTERVAL_MS = 900  # ms entre tentativas de spawn
+MIN_SPAWN_INTERVAL_MS = 350     # limite mínimo do intervalo de spawn
+SPAWN_INTERVAL_STEP_MS = 4      # redução do intervalo a cada alvo criado
+SPAWN_CHANCE = 0.9              # chance de criar alvo em cada tentativa
+TARGET_SIZE = (100, 133)        # tamanho do sprite do alvo (simulação sem display)
 DB_FILE = os.path.join(BASE_DIR, "scores.db")
+
+# Leaderboard compartilhado (ver code/score_server.py)
+SCORE_SERVER = None             # "host:porta" do servidor; None = banco local (DB_FILE)
+SCORE_SERVER_PORT = 8765
+TELEMETRY = True                # grava eventos por alvo de cada partida (code/telemetry.py)
+SCORE_QUEUE_FILE = os.path.join(BASE_DIR, "score_queue.jsonl")  # scores ainda não enviados
+
+# Replays
+RECORD_MATCHES = False          # grava toda partida em REPLAY_DIR
+REPLAY_DIR = os.path.join(BASE_DIR, "replays")
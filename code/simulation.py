@@ -0,0 +1,251 @@
+# simulation.py
+import random
+
+from code.settings import WIDTH, HEIGHT, FPS, INITIAL_TIME, TIME_REWARD, SCORE_PER_HIT, INITIAL_TARGET_ACTIVE_MS, \
+    INITIAL_WARNING_MS, MIN_ACTIVE_MS, ACTIVE_MS_STEP, INITIAL_SPAWN_INTERVAL_MS, MIN_SPAWN_INTERVAL_MS, \
+    SPAWN_INTERVAL_STEP_MS, SPAWN_CHANCE, TARGET_SIZE, SIM_HZ, MAX_FRAME_MS
+from code.target_pool import TargetPool, ACTIVE, EXPIRED
+from code.telemetry import HIT, EXPIRED as TELEMETRY_EXPIRED
+
+
+class MatchState:
+    """
+    Estado observável de uma partida depois de cada passo da simulação.
+    """
+
+    __slots__ = ("score", "time_left", "play_time", "spawn_interval", "target_active_ms",
+                 "hits", "misses", "spawned", "finished", "last_hits", "last_misses")
+
+    def __init__(self, time_left, spawn_interval, target_active_ms):
+        self.score = 0
+        self.time_left = time_left          # segundos restantes
+        self.play_time = 0.0                # segundos jogados (tempo simulado)
+        self.spawn_interval = spawn_interval
+        self.target_active_ms = target_active_ms
+        self.hits = 0
+        self.misses = 0                     # cliques que não acertaram nada
+        self.spawned = 0
+        self.finished = False
+        self.last_hits = []                 # posições acertadas no último passo
+        self.last_misses = []               # posições erradas no último passo
+
+
+class Simulation:
+    """
+    Regras da partida sem renderização nem eventos do pygame. Uso:
+      sim = Simulation(rng=random.Random(seed))
+      state = sim.step(dt_ms, [(x, y), ...])
+    Não precisa de display: pode rodar milhares de partidas por segundo.
+    """
+
+    def __init__(self, width=WIDTH, height=HEIGHT, target_size=TARGET_SIZE, rng=None,
+                 initial_time=INITIAL_TIME, time_reward=TIME_REWARD, score_per_hit=SCORE_PER_HIT,
+                 initial_active_ms=INITIAL_TARGET_ACTIVE_MS, warning_ms=INITIAL_WARNING_MS,
+                 min_active_ms=MIN_ACTIVE_MS, active_ms_step=ACTIVE_MS_STEP,
+                 initial_spawn_interval=INITIAL_SPAWN_INTERVAL_MS, min_spawn_interval=MIN_SPAWN_INTERVAL_MS,
+                 spawn_interval_step=SPAWN_INTERVAL_STEP_MS, spawn_chance=SPAWN_CHANCE, telemetry=None):
+        self.width = width
+        self.height = height
+        self.target_size = tuple(target_size)
+        self.rng = rng if rng is not None else random.Random()
+
+        self.time_reward = time_reward
+        self.score_per_hit = score_per_hit
+        self.warning_ms = warning_ms
+        self.min_active_ms = min_active_ms
+        self.active_ms_step = active_ms_step
+        self.min_spawn_interval = min_spawn_interval
+        self.spawn_interval_step = spawn_interval_step
+        self.spawn_chance = spawn_chance
+
+        self.state = MatchState(initial_time, initial_spawn_interval, initial_active_ms)
+        self.targets = TargetPool(self.target_size)
+        self.spawn_timer = 0.0
+        self.profiler = None  # FrameProfiler opcional: fases clicks/spawn/update
+        # MatchTelemetry opcional: eventos por alvo (ver code/telemetry.py)
+        self.telemetry = telemetry
+        if telemetry is not None:
+            self.targets.events = []
+
+    def step(self, dt, clicks=()):
+        """
+        Avança a partida em dt milissegundos aplicando os cliques (posições)
+        recebidos nesse intervalo. Retorna o MatchState atualizado.
+        """
+        state = self.state
+        state.last_hits = []
+        state.last_misses = []
+        if state.finished:
+            return state
+
+        # atualiza timer em segundos
+        state.time_left -= dt / 1000.0
+        state.play_time += dt / 1000.0
+
+        for pos in clicks:
+            hits = self.targets.hit_test(pos[0], pos[1])
+            for _ in range(hits):
+                # acerto
+                state.score += self.score_per_hit
+                state.time_left += self.time_reward
+                state.hits += 1
+                state.last_hits.append(pos)
+                # reduzir tempo de exibição do alvo progressivamente
+                state.target_active_ms = max(self.min_active_ms, state.target_active_ms - self.active_ms_step)
+            if not hits:
+                state.misses += 1
+                state.last_misses.append(pos)
+                if self.telemetry is not None:
+                    self.telemetry.missed(state.play_time * 1000.0)
+        prof = self.profiler
+        if prof:
+            prof.lap("clicks")
+
+        # spawn logic
+        self.spawn_timer += dt
+        if self.spawn_timer >= state.spawn_interval:
+            self.spawn_timer = 0
+            # chance de spawn
+            if self.rng.random() < self.spawn_chance:
+                # cria target com warning_ms e active_ms atual em posição aleatória dentro de margens
+                w, h = self.target_size
+                x = self.rng.randint(20, self.width - w - 20)
+                y = self.rng.randint(60, self.height - h - 20)
+                tag = self.telemetry.spawned(state.play_time * 1000.0) if self.telemetry is not None else -1
+                self.targets.spawn(x, y, self.warning_ms, state.target_active_ms, tag)
+                state.spawned += 1
+                # reduzir spawn_interval conforme o tempo passa (mais alvos)
+                state.spawn_interval = max(self.min_spawn_interval, state.spawn_interval - self.spawn_interval_step)
+        if prof:
+            prof.lap("spawn")
+
+        # update targets (alvos clicados também saem aqui)
+        self.targets.update(dt)
+        if self.telemetry is not None:
+            self._record_events(state.play_time * 1000.0)
+        if prof:
+            prof.lap("update")
+
+        if state.time_left <= 0:
+            state.finished = True
+        return state
+
+    def _record_events(self, now_ms):
+        """
+        Passa para a telemetria as transições registradas pelo pool neste
+        passo (cliques, ativações e expirações; todas no instante do passo).
+        """
+        telemetry = self.telemetry
+        events = self.targets.events
+        for kind, tag in events:
+            if tag < 0:
+                continue  # alvo criado fora do spawn da simulação
+            if kind == ACTIVE:
+                telemetry.activated(tag, now_ms)
+            elif kind == EXPIRED:
+                telemetry.ended(tag, now_ms, TELEMETRY_EXPIRED)
+            else:
+                telemetry.ended(tag, now_ms, HIT)
+        events.clear()
+
+    def active_targets(self):
+        """
+        Centros dos alvos clicáveis neste momento (útil para jogadores simulados).
+        """
+        return self.targets.active_centers()
+
+
+class FixedStepper:
+    """
+    Avança uma Simulation em passos fixos de step_ms a partir do dt variável
+    de cada quadro (acumulador). Um quadro lento gera vários passos e um
+    rápido pode não gerar nenhum, então a renderização não altera as regras.
+    Quadros acima de max_frame_ms são cortados (catch-up limitado) e o tempo
+    descartado fica em dropped_ms. Se 'recorder' for definido (MatchRecorder),
+    os cliques de cada passo são gravados nele.
+    """
+
+    def __init__(self, sim, step_ms=1000.0 / SIM_HZ, max_frame_ms=MAX_FRAME_MS):
+        self.sim = sim
+        self.step_ms = step_ms
+        self.max_frame_ms = max_frame_ms
+        self.accumulator = 0.0
+        self.steps = 0           # total de passos executados
+        self.dropped_ms = 0.0
+        self._clicks = []        # cliques ainda não aplicados
+        self._timed = []         # (índice do passo, (x, y)) ainda não aplicados
+        self.frame_hits = []     # acertos (posições) do último advance()
+        self.frame_misses = []
+        self.frame_clicks = 0    # cliques aplicados no último advance()
+        self.recorder = None
+
+    def advance(self, frame_dt, clicks=(), timed_clicks=()):
+        """
+        Acumula frame_dt (ms) e executa os passos completos. Retorna quantos
+        passos foram dados.
+        clicks: entram no primeiro passo executado.
+        timed_clicks: [(offset, (x, y)), ...], offset em ms desde a chamada
+        anterior de advance(). Cada clique entra no passo que cobre aquele
+        instante, ou seja, é testado contra os alvos como estavam quando o
+        jogador clicou (arredondado para o passo), não no início do quadro.
+        """
+        # instante (em ms de simulação) correspondente à chamada anterior
+        base = self.steps * self.step_ms + self.accumulator
+        if frame_dt > self.max_frame_ms:
+            self.dropped_ms += frame_dt - self.max_frame_ms
+            frame_dt = self.max_frame_ms
+        for offset, pos in timed_clicks:
+            index = int((base + min(max(offset, 0.0), frame_dt)) / self.step_ms)
+            self._timed.append((max(index, self.steps), pos))
+        self.accumulator += frame_dt
+        self._clicks.extend(clicks)
+        self.frame_hits = []
+        self.frame_misses = []
+        self.frame_clicks = 0
+
+        steps = 0
+        sim = self.sim
+        timed = self._timed
+        while self.accumulator >= self.step_ms and not sim.state.finished:
+            index = self.steps + steps
+            clicks = self._clicks
+            if clicks:
+                self._clicks = []
+            if timed and timed[0][0] <= index:
+                n = 0
+                while n < len(timed) and timed[n][0] <= index:
+                    n += 1
+                clicks = clicks + [pos for _, pos in timed[:n]]
+                del timed[:n]
+            if clicks:
+                self.frame_clicks += len(clicks)
+                if self.recorder:
+                    self.recorder.record_step(index, clicks)
+            state = sim.step(self.step_ms, clicks)
+            self.frame_hits.extend(state.last_hits)
+            self.frame_misses.extend(state.last_misses)
+            self.accumulator -= self.step_ms
+            steps += 1
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """
+        Fração (0..1) do próximo passo já decorrida, para interpolar o desenho.
+        """
+        return self.accumulator / self.step_ms
+
+
+def run_match(sim, player=None, dt=1000.0 / FPS, max_play_time=600.0):
+    """
+    Roda uma partida inteira sem display. 'player' é uma função
+    player(sim) -> lista de cliques para o próximo passo; None = ninguém clica.
+    max_play_time (s) evita partidas infinitas com jogadores perfeitos.
+    Retorna o MatchState final.
+    """
+    state = sim.state
+    while not state.finished and state.play_time < max_play_time:
+        clicks = player(sim) if player is not None else ()
+        state = sim.step(dt, clicks)
+    return state
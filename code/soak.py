@@ -0,0 +1,411 @@
+# soak.py
+"""
+Modo soak: joga sozinho por horas (menu -> nome -> partida -> resultado ->
+menu ...) com entrada sintética e spawn extremo, medindo se algo cresce com
+o tempo. Uso:
+  python -m code.soak --duration 3600 --report-every 60 --headless
+
+Uma thread posta eventos do pygame conforme a tela atual (cliques nos
+botões, nome, cliques na partida, OK) e, a cada --report-every segundos,
+mede: RSS do processo (/proc/self/statm), alocações Python (tracemalloc,
+com as linhas que mais cresceram desde o primeiro relatório), objetos vivos
+(Surfaces, Game, ScoreManager, ...), tamanho do banco (temporário, não toca
+no scores.db) e tempo de quadro da partida. Cada relatório vira uma linha
+de report.jsonl; ao final, o resumo mostra a inclinação (por hora) de cada
+métrica. As medições com gc/tracemalloc pausam o jogo por alguns ms: o
+quadro em que isso acontece aparece no max, não no p95.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from code.settings import BASE_DIR, WIDTH, HEIGHT
+
+SOAK_DIR = os.path.join(BASE_DIR, "soak")
+
+# partida com spawn extremo e sem tempo extra por acerto (termina sozinha)
+EXTREME = {
+    "time_reward": 0.0,
+    "warning_ms": 300.0,
+    "initial_active_ms": 900.0,
+    "min_active_ms": 600.0,
+    "spawn_chance": 1.0,
+    "spawn_interval_step": 0.0,
+}
+
+
+def rss_bytes():
+    """
+    Memória residente do processo (Linux: /proc/self/statm); None se indisponível.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    pick = lambda q: round(values[min(len(values) - 1, int(q * len(values)))], 3)
+    return {"p50": pick(0.50), "p95": pick(0.95), "max": round(values[-1], 3)}
+
+
+def _slope_per_hour(points):
+    """
+    Inclinação (mínimos quadrados) de [(segundos, valor), ...], por hora.
+    """
+    points = [(t, v) for t, v in points if v is not None]
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mt = sum(t for t, _ in points) / n
+    mv = sum(v for _, v in points) / n
+    den = sum((t - mt) ** 2 for t, _ in points)
+    if not den:
+        return None
+    return round(sum((t - mt) * (v - mv) for t, v in points) / den * 3600.0, 3)
+
+
+class Soak:
+    """
+    Estado compartilhado entre o jogo (thread principal, via SoakMenu/SoakGame)
+    e a thread que gera a entrada e os relatórios.
+    """
+
+    def __init__(self, args, db_path, out_dir):
+        self.args = args
+        self.db_path = db_path
+        self.out_dir = out_dir
+        self.rng = random.Random(args.seed)
+        self.phase = "menu"       # menu | scores | name | match | result
+        self.cycles = 0           # partidas completas (de volta ao menu)
+        self.stop = threading.Event()
+        self.menu = None
+        self.started = time.perf_counter()
+
+        # tempos de quadro da partida desde o último relatório (ms)
+        self._frames_lock = threading.Lock()
+        self.draw_ms = []
+        self.interval_ms = []
+        self.match_fps = []
+
+        self.reports = []
+        self._baseline_snapshot = None
+
+    # --- tempos de quadro (thread principal) ------------------------------
+    def frame(self, draw_ms, interval_ms):
+        with self._frames_lock:
+            self.draw_ms.append(draw_ms)
+            if interval_ms is not None:
+                self.interval_ms.append(interval_ms)
+
+    def match_done(self, result):
+        with self._frames_lock:
+            self.match_fps.append(result.get("stats", {}).get("frames_per_sec", 0.0))
+
+    def _take_frames(self):
+        with self._frames_lock:
+            frames = (self.draw_ms, self.interval_ms, self.match_fps)
+            self.draw_ms, self.interval_ms, self.match_fps = [], [], []
+        return frames
+
+    # --- entrada sintética ------------------------------------------------
+    def _post(self, event_type, **attrs):
+        import pygame
+        pygame.event.post(pygame.event.Event(event_type, **attrs))
+
+    def _click(self, pos, down=True):
+        import pygame
+        if down:
+            self._post(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+        self._post(pygame.MOUSEBUTTONUP, pos=pos, button=1)
+
+    def _wait_phase_change(self, phase, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.phase == phase and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.phase != phase
+
+    def drive(self):
+        """
+        Thread de entrada: age conforme a tela atual até stop e, no fim,
+        leva o jogo de volta ao menu e o fecha.
+        """
+        import pygame
+        args = self.args
+        next_report = time.monotonic() + args.report_every
+        deadline = time.monotonic() + args.duration
+        click_gap = 1.0 / args.clicks_per_sec
+        scores_cycle = -1
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= next_report:
+                    self.report()
+                    next_report = now + args.report_every
+                if now >= deadline or (args.cycles and self.cycles >= args.cycles):
+                    self.stop.set()
+                phase = self.phase
+                if phase == "menu":
+                    if self.stop.is_set():
+                        self._post(pygame.QUIT)
+                        return
+                    # de vez em quando passa pelo scoreboard (paginação), uma vez por ciclo
+                    index = 0
+                    if args.scores_every and self.cycles % args.scores_every == args.scores_every - 1 \
+                            and scores_cycle != self.cycles:
+                        scores_cycle = self.cycles
+                        index = 1
+                    self._click(self.menu.buttons[index].rect.center, down=False)
+                    self._wait_phase_change("menu")
+                elif phase == "scores":
+                    self._post(pygame.KEYDOWN, key=pygame.K_RIGHT, unicode="")
+                    self._post(pygame.KEYDOWN, key=pygame.K_ESCAPE, unicode="")
+                    self._wait_phase_change("scores")
+                elif phase == "name":
+                    name = f"SOAK{self.rng.randrange(100)}"
+                    for ch in name:
+                        self._post(pygame.KEYDOWN, key=ord(ch.lower()), unicode=ch)
+                    self._post(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r")
+                    self._wait_phase_change("name")
+                elif phase == "match":
+                    if self.stop.is_set():
+                        self._post(pygame.QUIT)  # encerra a partida (o score é gravado)
+                        self._wait_phase_change("match")
+                        continue
+                    pos = (self.rng.randint(20, WIDTH - 20), self.rng.randint(60, HEIGHT - 20))
+                    self._click(pos)
+                    time.sleep(click_gap)
+                elif phase == "result":
+                    self._click((WIDTH // 2, HEIGHT // 2 + 65))
+                    self._wait_phase_change("result")
+                else:
+                    time.sleep(0.01)
+        except Exception as e:
+            print(f"[soak] thread de entrada falhou: {e!r}", file=sys.stderr)
+            self.stop.set()
+            self._post(pygame.QUIT)
+
+    # --- relatórios -------------------------------------------------------
+    def _object_counts(self):
+        import pygame
+        from code.game import Game
+        from code.menu import Menu
+        from code.score_manager import ScoreManager
+        from code.simulation import Simulation
+        from code.effects import ParticlePool
+        kinds = {"Surface": pygame.Surface, "Game": Game, "Menu": Menu, "ScoreManager": ScoreManager,
+                 "Simulation": Simulation, "ParticlePool": ParticlePool}
+        counts = dict.fromkeys(kinds, 0)
+        surfaces = set()
+        surface_type = pygame.Surface
+        for obj in gc.get_objects():
+            for name, cls in kinds.items():
+                if isinstance(obj, cls):
+                    counts[name] += 1
+            # Surface não é rastreada pelo gc: conta as referenciadas por objetos rastreados
+            for ref in gc.get_referents(obj):
+                if type(ref) is surface_type:
+                    surfaces.add(id(ref))
+        counts["Surface"] = len(surfaces)
+        counts["threads"] = threading.active_count()
+        return counts
+
+    def report(self):
+        from code.text_cache import text_cache
+        from code.asset_cache import asset_cache
+        elapsed = time.perf_counter() - self.started
+        draw_ms, interval_ms, match_fps = self._take_frames()
+        gc.collect()
+        rss = rss_bytes()
+        report = {
+            "elapsed_s": round(elapsed, 1),
+            "cycles": self.cycles,
+            "rss_mb": round(rss / 2 ** 20, 2) if rss else None,
+            "objects": self._object_counts(),
+            "db_bytes": sum(os.path.getsize(p) for p in (self.db_path, self.db_path + "-wal")
+                            if os.path.exists(p)),
+            "text_cache": {k: text_cache.stats()[k] for k in ("entries", "bytes")},
+            "asset_cache": {k: asset_cache.stats()[k] for k in ("entries", "bytes")},
+            "frames": len(draw_ms),
+            "draw_ms": _percentiles(draw_ms),
+            "frame_interval_ms": _percentiles(interval_ms),
+            "match_fps": round(sum(match_fps) / len(match_fps), 1) if match_fps else None,
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report["py_alloc_mb"] = round(current / 2 ** 20, 2)
+            report["py_peak_mb"] = round(peak / 2 ** 20, 2)
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__),))
+            if self._baseline_snapshot is None:
+                self._baseline_snapshot = snapshot
+            else:
+                diffs = snapshot.compare_to(self._baseline_snapshot, "lineno")
+                top = sorted((d for d in diffs if d.size_diff > 0), key=lambda d: d.size_diff, reverse=True)[:5]
+                report["py_growth_top"] = [
+                    {"where": f"{d.traceback[0].filename}:{d.traceback[0].lineno}",
+                     "kb": round(d.size_diff / 1024, 1), "count": d.count_diff}
+                    for d in top]
+        self.reports.append(report)
+        with open(os.path.join(self.out_dir, "report.jsonl"), "a") as f:
+            f.write(json.dumps(report) + "\n")
+        print(f"[soak] {report['elapsed_s']:.0f}s ciclos={report['cycles']} rss={report['rss_mb']}MB "
+              f"py={report.get('py_alloc_mb', '-')}MB surfaces={report['objects']['Surface']} "
+              f"games={report['objects']['Game']} db={report['db_bytes'] // 1024}KB "
+              f"draw p95={report['draw_ms'].get('p95')}ms fps={report['match_fps']}", flush=True)
+
+    def summary(self):
+        """
+        Inclinação por hora de cada métrica ao longo dos relatórios (depois do
+        primeiro, que inclui o aquecimento: caches, imports, primeiro banco).
+        """
+        reports = self.reports[1:] if len(self.reports) > 2 else self.reports
+        series = {
+            "rss_mb": [(r["elapsed_s"], r["rss_mb"]) for r in reports],
+            "py_alloc_mb": [(r["elapsed_s"], r.get("py_alloc_mb")) for r in reports],
+            "surfaces": [(r["elapsed_s"], r["objects"]["Surface"]) for r in reports],
+            "games": [(r["elapsed_s"], r["objects"]["Game"]) for r in reports],
+            "threads": [(r["elapsed_s"], r["objects"]["threads"]) for r in reports],
+            "db_kb": [(r["elapsed_s"], r["db_bytes"] / 1024) for r in reports],
+            "draw_p95_ms": [(r["elapsed_s"], r["draw_ms"].get("p95")) for r in reports],
+        }
+        result = {
+            "reports": len(self.reports),
+            "cycles": self.cycles,
+            "elapsed_s": self.reports[-1]["elapsed_s"] if self.reports else 0,
+            "slope_per_hour": {name: _slope_per_hour(points) for name, points in series.items()},
+        }
+        if self.reports:
+            first, last = self.reports[0], self.reports[-1]
+            result["first"] = {k: first[k] for k in ("rss_mb", "objects", "db_bytes", "draw_ms")}
+            result["last"] = {k: last[k] for k in ("rss_mb", "objects", "db_bytes", "draw_ms")}
+        return result
+
+
+def _soak_classes(soak):
+    """
+    Subclasses de Menu e Game que só avisam a tela atual ao Soak e medem os
+    quadros; o fluxo é o do jogo normal (Menu._on_start cria um Game por partida).
+    """
+    from code.game import Game
+    from code.menu import Menu
+
+    class SoakGame(Game):
+        def run(self, player_name, record_path=None):
+            soak.phase = "match"
+            self._soak_last = None
+            result = super().run(player_name, record_path)
+            soak.match_done(result)
+            return result
+
+        def _draw_match(self, sim, state, alpha=0.0, step_ms=0.0):
+            t0 = time.perf_counter()
+            super()._draw_match(sim, state, alpha, step_ms)
+            interval = (t0 - self._soak_last) * 1000.0 if self._soak_last else None
+            self._soak_last = t0
+            soak.frame((time.perf_counter() - t0) * 1000.0, interval)
+
+        def _show_result_screen(self, *args, **kwargs):
+            soak.phase = "result"
+            return super()._show_result_screen(*args, **kwargs)
+
+    class SoakMenu(Menu):
+        def _ask_player_name(self):
+            soak.phase = "name"
+            name = super()._ask_player_name()
+            soak.phase = "starting"
+            return name
+
+        def _on_start(self):
+            super()._on_start()
+            soak.cycles += 1
+            soak.phase = "menu"
+
+        def _on_score(self):
+            soak.phase = "scores"
+            super()._on_score()
+            soak.phase = "menu"
+
+    return SoakMenu, SoakGame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Modo soak: sessões longas automáticas medindo crescimento")
+    parser.add_argument("--duration", type=float, default=600.0, help="segundos de jogo (padrão: 10 min)")
+    parser.add_argument("--cycles", type=int, default=0, help="para depois de N partidas (0 = só --duration)")
+    parser.add_argument("--report-every", type=float, default=30.0, help="segundos entre relatórios")
+    parser.add_argument("--match-seconds", type=float, default=10.0, help="duração de cada partida")
+    parser.add_argument("--spawn-interval", type=float, default=20.0, help="ms entre spawns (extremo)")
+    parser.add_argument("--clicks-per-sec", type=float, default=20.0)
+    parser.add_argument("--scores-every", type=int, default=5, help="visita o scoreboard a cada N partidas")
+    parser.add_argument("--headless", action="store_true", help="sem janela nem som (drivers dummy do SDL)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="sem snapshots de alocação (mais rápido)")
+    parser.add_argument("--keep-db", action="store_true", help="não apaga o banco temporário no fim")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="pasta dos relatórios (padrão: soak/<data-hora>)")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    import pygame
+    from code.score_manager import ScoreManager
+
+    out_dir = args.out or os.path.join(SOAK_DIR, time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix="soak-")
+    db_path = os.path.join(tmp_dir, "soak.db")
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Speed Of Light (soak)")
+    clock = pygame.time.Clock()
+
+    soak = Soak(args, db_path, out_dir)
+    SoakMenu, SoakGame = _soak_classes(soak)
+    sim_params = dict(EXTREME, initial_time=args.match_seconds,
+                      initial_spawn_interval=args.spawn_interval, min_spawn_interval=args.spawn_interval)
+    manager = ScoreManager(db_path)
+    try:
+        soak.menu = SoakMenu(screen, clock, manager, game_class=SoakGame, sim_params=sim_params)
+        driver = threading.Thread(target=soak.drive, name="soak-input", daemon=True)
+        driver.start()
+        soak.menu.loop()
+        driver.join(10)
+        soak.report()
+    except KeyboardInterrupt:
+        soak.stop.set()
+    finally:
+        manager.close()
+        pygame.quit()
+        if args.keep_db:
+            print(f"banco: {db_path}")
+        else:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    summary = soak.summary()
+    with open(os.path.join(out_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    print(json.dumps(summary["slope_per_hour"], indent=2))
+    print(f"relatórios em {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+# sweep.py
+"""
+Varredura de dificuldade: roda partidas sem display (Simulation) com
+jogadores simulados para cada combinação de parâmetros, num pool de
+processos. Uso:
+  python -m code.sweep --param initial_time=20,30,40 --param spawn_chance=0.8,0.9 \\
+      --reaction normal:350,80 --reaction lognormal:450,0.35 --matches 200
+
+--param nome=v1,v2,...   argumento da Simulation (ver PARAMS); vira um eixo da grade
+--reaction dist:a,b      tempo de reação do jogador (ms), também um eixo:
+                           fixed:ms | uniform:min,max | normal:média,desvio |
+                           lognormal:mediana,sigma
+Cada partida terminada é gravada em matches.jsonl assim que o worker entrega
+o lote; ao final, summary.json/summary.csv trazem por configuração as
+distribuições de pontos, duração da partida e alvos vivos por passo.
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from code.settings import BASE_DIR, SIM_HZ
+from code.simulation import Simulation, run_match
+
+# parâmetros da Simulation que podem ser varridos (nome -> tipo)
+PARAMS = {
+    "initial_time": float,
+    "time_reward": float,
+    "score_per_hit": int,
+    "initial_active_ms": float,
+    "warning_ms": float,
+    "min_active_ms": float,
+    "active_ms_step": float,
+    "initial_spawn_interval": float,
+    "min_spawn_interval": float,
+    "spawn_interval_step": float,
+    "spawn_chance": float,
+}
+
+SWEEP_DIR = os.path.join(BASE_DIR, "sweeps")
+
+
+def parse_reaction(spec):
+    """
+    'normal:350,80' -> ("normal", (350.0, 80.0)); valida o nome e os argumentos.
+    """
+    name, _, args = spec.partition(":")
+    values = tuple(float(v) for v in args.split(",") if v)
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    if name not in expected or len(values) != expected[name]:
+        raise ValueError(f"tempo de reação inválido: {spec!r}")
+    return name, values
+
+
+def sample_reaction(rng, dist):
+    name, args = dist
+    if name == "fixed":
+        value = args[0]
+    elif name == "uniform":
+        value = rng.uniform(*args)
+    elif name == "normal":
+        value = rng.gauss(*args)
+    else:
+        value = rng.lognormvariate(math.log(args[0]), args[1])
+    return max(value, 0.0)
+
+
+class SimulatedPlayer:
+    """
+    Jogador com tempo de reação aleatório. Vê cada alvo quando ele fica
+    ativo e clica nele após um tempo de reação sorteado; como uma pessoa,
+    trata um alvo por vez (a reação ao próximo só começa depois do clique
+    anterior). Se o alvo já sumiu quando a reação termina, não clica.
+    'accuracy' é a chance de o clique acertar (senão vai para um canto vazio).
+    """
+
+    def __init__(self, rng, reaction, accuracy=1.0):
+        self.rng = rng
+        self.reaction = reaction
+        self.accuracy = accuracy
+        self.seen = set()      # centros dos alvos ativos já notados
+        self.queue = []        # (instante do clique em ms, centro)
+        self.busy_until = 0.0
+        self.live_counts = []  # alvos vivos (warning + ativos) a cada passo
+
+    def __call__(self, sim):
+        now = sim.state.play_time * 1000.0
+        self.live_counts.append(sim.targets.count)
+        centers = sim.active_targets()
+        # esquece os que sumiram: um alvo novo no mesmo centro é outro alvo
+        self.seen.intersection_update(centers)
+        for center in centers:
+            if center not in self.seen:
+                self.seen.add(center)
+                start = max(now, self.busy_until)
+                self.busy_until = start + sample_reaction(self.rng, self.reaction)
+                self.queue.append((self.busy_until, center))
+
+        clicks = []
+        while self.queue and self.queue[0][0] <= now:
+            _, center = self.queue.pop(0)
+            if center not in centers:
+                continue  # alvo expirou antes da reação
+            if self.rng.random() < self.accuracy:
+                clicks.append(center)
+            else:
+                clicks.append((2, 2))  # fora da área de spawn: erro
+        return clicks
+
+
+def run_batch(config_id, params, reaction, accuracy, seeds, max_play_time):
+    """
+    Worker: roda uma partida por seed e retorna a lista de resultados.
+    """
+    step_ms = 1000.0 / SIM_HZ
+    results = []
+    for seed in seeds:
+        rng = random.Random(seed)
+        sim = Simulation(rng=random.Random(rng.getrandbits(64)), **params)
+        player = SimulatedPlayer(random.Random(rng.getrandbits(64)), reaction, accuracy)
+        state = run_match(sim, player, dt=step_ms, max_play_time=max_play_time)
+        counts = player.live_counts
+        histogram = {}
+        for n in counts:
+            histogram[n] = histogram.get(n, 0) + 1
+        results.append({
+            "config": config_id,
+            "seed": seed,
+            "score": state.score,
+            "play_time": round(state.play_time, 3),
+            "hits": state.hits,
+            "misses": state.misses,
+            "spawned": state.spawned,
+            "capped": not state.finished,
+            "live_mean": round(sum(counts) / len(counts), 3) if counts else 0.0,
+            "live_histogram": histogram,
+        })
+    return results
+
+
+def _percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {
+        "mean": round(sum(values) / len(values), 3),
+        "p10": pick(0.10), "p50": pick(0.50), "p90": pick(0.90),
+        "min": values[0], "max": values[-1],
+    }
+
+
+def _histogram_percentiles(histogram):
+    total = sum(histogram.values())
+    if not total:
+        return {}
+    result = {"mean": round(sum(n * c for n, c in histogram.items()) / total, 3)}
+    keys = sorted(histogram)
+    for name, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+        seen = 0
+        for n in keys:
+            seen += histogram[n]
+            if seen > q * total:
+                result[name] = n
+                break
+    result["max"] = keys[-1]
+    return result
+
+
+def build_grid(param_specs, reactions):
+    """
+    Lista de configurações (params, reação) do produto cartesiano dos eixos.
+    """
+    axes = []
+    for spec in param_specs:
+        name, _, values = spec.partition("=")
+        if name not in PARAMS:
+            raise ValueError(f"parâmetro desconhecido: {name} (opções: {', '.join(PARAMS)})")
+        axes.append([(name, PARAMS[name](v)) for v in values.split(",") if v])
+    grid = []
+    for combo in itertools.product(*axes):
+        for reaction in reactions:
+            grid.append((dict(combo), reaction))
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura de dificuldade do Speed Of Light")
+    parser.add_argument("--param", action="append", default=[], metavar="NOME=V1,V2",
+                        help="eixo da grade (repetível)")
+    parser.add_argument("--reaction", action="append", metavar="DIST:ARGS",
+                        help="tempo de reação do jogador em ms (repetível; padrão normal:350,80)")
+    parser.add_argument("--accuracy", type=float, default=0.95, help="chance de acerto de cada clique")
+    parser.add_argument("--matches", type=int, default=100, help="partidas por configuração")
+    parser.add_argument("--batch", type=int, default=25, help="partidas por tarefa do pool")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: nº de CPUs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-play-time", type=float, default=600.0,
+                        help="limite de tempo simulado por partida (s)")
+    parser.add_argument("--out", default=None, help="pasta de saída (padrão: sweeps/<data-hora>)")
+    args = parser.parse_args(argv)
+
+    try:
+        reactions = [parse_reaction(r) for r in (args.reaction or ["normal:350,80"])]
+        grid = build_grid(args.param, reactions)
+    except ValueError as e:
+        parser.error(str(e))
+
+    out_dir = args.out or os.path.join(SWEEP_DIR, time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(out_dir, exist_ok=True)
+
+    configs = []
+    for config_id, (params, reaction) in enumerate(grid):
+        configs.append({"config": config_id, "params": params,
+                        "reaction": f"{reaction[0]}:{','.join(f'{v:g}' for v in reaction[1])}"})
+    with open(os.path.join(out_dir, "configs.json"), "w") as f:
+        json.dump(configs, f, indent=2)
+
+    scores = {c["config"]: [] for c in configs}
+    lengths = {c["config"]: [] for c in configs}
+    capped = {c["config"]: 0 for c in configs}
+    live = {c["config"]: {} for c in configs}
+
+    t0 = time.perf_counter()
+    done = 0
+    total = len(grid) * args.matches
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, \
+            open(os.path.join(out_dir, "matches.jsonl"), "w") as matches_file:
+        futures = []
+        for config_id, (params, reaction) in enumerate(grid):
+            for start in range(0, args.matches, args.batch):
+                # seed por partida: a mesma configuração reproduz as mesmas partidas
+                seeds = [args.seed * 1_000_003 + config_id * 100_003 + i
+                         for i in range(start, min(start + args.batch, args.matches))]
+                futures.append(pool.submit(run_batch, config_id, params, reaction, args.accuracy,
+                                           seeds, args.max_play_time))
+        for future in as_completed(futures):
+            for row in future.result():
+                cid = row["config"]
+                scores[cid].append(row["score"])
+                lengths[cid].append(row["play_time"])
+                capped[cid] += row["capped"]
+                hist = live[cid]
+                for n, c in row["live_histogram"].items():
+                    hist[n] = hist.get(n, 0) + c
+                matches_file.write(json.dumps(row) + "\n")
+                done += 1
+            matches_file.flush()  # cada lote vai para o disco assim que termina
+            print(f"\r{done}/{total} partidas", end="", file=sys.stderr, flush=True)
+    elapsed = time.perf_counter() - t0
+    print(f"\r{done} partidas em {elapsed:.1f}s ({done / elapsed:.0f}/s)", file=sys.stderr)
+
+    summary = []
+    for c in configs:
+        cid = c["config"]
+        summary.append(dict(c, matches=len(scores[cid]), capped=capped[cid],
+                            score=_percentiles(scores[cid]),
+                            play_time=_percentiles(lengths[cid]),
+                            live_targets=_histogram_percentiles(live[cid])))
+    with open(os.path.join(out_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    names = sorted({k for c in configs for k in c["params"]})
+    with open(os.path.join(out_dir, "summary.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["config"] + names + ["reaction", "matches", "capped",
+                                              "score_mean", "score_p10", "score_p50", "score_p90",
+                                              "time_mean", "time_p50", "time_p90",
+                                              "live_mean", "live_p50", "live_p90", "live_max"])
+        for s in summary:
+            sc, pt, lv = s["score"], s["play_time"], s["live_targets"]
+            writer.writerow([s["config"]] + [s["params"].get(n, "") for n in names] +
+                            [s["reaction"], s["matches"], s["capped"],
+                             sc.get("mean"), sc.get("p10"), sc.get("p50"), sc.get("p90"),
+                             pt.get("mean"), pt.get("p50"), pt.get("p90"),
+                             lv.get("mean"), lv.get("p50"), lv.get("p90"), lv.get("max")])
+
+    for s in summary:
+        params = " ".join(f"{k}={v:g}" for k, v in s["params"].items())
+        print(f"[{s['config']}] {params} {s['reaction']}: score p50={s['score'].get('p50')} "
+              f"p90={s['score'].get('p90')} | tempo p50={s['play_time'].get('p50')}s | "
+              f"alvos vivos média={s['live_targets'].get('mean')} max={s['live_targets'].get('max')}")
+    print(f"resultados em {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,27 @@
 import pygame
 import random
 from code.settings import *
+from code.asset_cache import asset_cache
+
+
+def load_sprites(screen_rect):
+    """
+    Retorna (target_img, shadow_img) já convertidos e escalados para a tela.
+    As surfaces vêm do cache compartilhado: só o primeiro alvo lê do disco.
+    """
+    target_img = asset_cache.get(TARGET_IMG)
+    shadow_img = asset_cache.get(TARGET_SHADOW_IMG)
+
+    # escala pequena caso seja maior que tela
+    max_w = screen_rect.width // 6
+    if target_img.get_width() > max_w:
+        scale = max_w / target_img.get_width()
+        new_size = (int(target_img.get_width()*scale), int(target_img.get_height()*scale))
+        target_img = asset_cache.get(TARGET_IMG, new_size)
+        shadow_img = asset_cache.get(TARGET_SHADOW_IMG, new_size)
+    return target_img, shadow_img
+
+
 class Target:
     """
     Representa um alvo com dois estágios:
@@ -9,27 +30,27 @@ class Target:
       2) active (alvo visível e clicável) - pode ser clicado para pontuação
     """
 
-    def __init__(self, screen_rect: pygame.Rect, active_ms=None, warning_ms=None):
+    def __init__(self, screen_rect: pygame.Rect, active_ms=None, warning_ms=None, size=None, rng=random):
+        """
+        size: (w, h) do alvo. Se informado, os sprites só são carregados no
+        primeiro draw(), o que permite usar Target sem display (simulação).
+        rng: fonte de aleatoriedade (módulo random ou random.Random).
+        """
         self.screen_rect = screen_rect
         self.active_ms = active_ms if active_ms is not None else INITIAL_TARGET_ACTIVE_MS
         self.warning_ms = warning_ms if warning_ms is not None else INITIAL_WARNING_MS
 
-        self.shadow_img = pygame.image.load(TARGET_SHADOW_IMG).convert_alpha()
-
-        self.target_img = pygame.image.load(TARGET_IMG).convert_alpha()
-
-        # escala pequena caso seja maior que tela
-        max_w = screen_rect.width // 6
-        if self.target_img.get_width() > max_w:
-            scale = max_w / self.target_img.get_width()
-            new_size = (int(self.target_img.get_width()*scale), int(self.target_img.get_height()*scale))
-            self.target_img = pygame.transform.smoothscale(self.target_img, new_size)
-            self.shadow_img = pygame.transform.smoothscale(self.shadow_img, new_size)
+        if size is None:
+            # sprites compartilhados (sem I/O nem escala por alvo)
+            self.target_img, self.shadow_img = load_sprites(screen_rect)
+            size = self.target_img.get_size()
+        else:
+            self.target_img = self.shadow_img = None
 
         # posição aleatória dentro de margens
-        w, h = self.target_img.get_size()
-        x = random.randint(20, screen_rect.width - w - 20)
-        y = random.randint(60, screen_rect.height - h - 20)
+        w, h = size
+        x = rng.randint(20, screen_rect.width - w - 20)
+        y = rng.randint(60, screen_rect.height - h - 20)
         self.pos = (x, y)
         self.rect = pygame.Rect(x, y, w, h)
 
@@ -51,6 +72,8 @@ class Target:
             self.state = "expired"
 
     def draw(self, surface):
+        if self.target_img is None:
+            self.target_img, self.shadow_img = load_sprites(self.screen_rect)
         if self.state == "warning":
             surface.blit(self.shadow_img, self.pos)
         elif self.state == "active":
@@ -0,0 +1,129 @@
+# target_pool.py
+
+# códigos de estado (mesma semântica dos estados string de Target)
+WARNING = 0
+ACTIVE = 1
+EXPIRED = 2
+GONE = 3  # clicado, removido na próxima compactação
+
+
+class TargetPool:
+    """
+    Armazenamento dos alvos em estrutura de arrays (uma lista pré-alocada por
+    campo; listas são mais rápidas que array.array em CPython por não
+    converterem cada elemento). Os slots vivos ficam sempre em [0, count):
+    update() avança timers, faz as transições de estado e compacta os que
+    morreram numa única passada, sem criar objetos. As listas só crescem
+    (dobrando) e os slots são reutilizados.
+    Todos os alvos do pool têm o mesmo tamanho (w, h).
+
+    tag: valor livre por alvo (ex.: índice na telemetria), mantido na
+    compactação. Com 'events' = [] o pool registra (ACTIVE | EXPIRED | GONE, tag)
+    a cada transição; quem lê deve esvaziar a lista. None (padrão) não registra.
+    """
+
+    def __init__(self, size, capacity=64):
+        self.w, self.h = size
+        self.count = 0
+        self.capacity = 0
+        self.x = []
+        self.y = []
+        self.state = []
+        self.timer = []       # ms desde o início do estágio atual
+        self.warning_ms = []
+        self.active_ms = []
+        self.tag = []
+        self.events = None
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        extra = capacity - self.capacity
+        self.x.extend([0] * extra)
+        self.y.extend([0] * extra)
+        self.state.extend([GONE] * extra)
+        self.timer.extend([0.0] * extra)
+        self.warning_ms.extend([0.0] * extra)
+        self.active_ms.extend([0.0] * extra)
+        self.tag.extend([-1] * extra)
+        self.capacity = capacity
+
+    def spawn(self, x, y, warning_ms, active_ms, tag=-1):
+        """
+        Ocupa o próximo slot livre com um alvo em estado warning. Retorna o índice.
+        """
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.state[i] = WARNING
+        self.timer[i] = 0.0
+        self.warning_ms[i] = warning_ms
+        self.active_ms[i] = active_ms
+        self.tag[i] = tag
+        self.count = i + 1
+        return i
+
+    def update(self, dt):
+        """
+        Avança todos os alvos em dt ms e remove expirados/clicados mantendo a
+        ordem dos que continuam vivos.
+        """
+        x, y, state, timer = self.x, self.y, self.state, self.timer
+        warning_ms, active_ms, tag = self.warning_ms, self.active_ms, self.tag
+        events = self.events
+        w = 0
+        for i in range(self.count):
+            st = state[i]
+            t = timer[i] + dt
+            if st == WARNING and t >= warning_ms[i]:
+                st = ACTIVE
+                # reseta timer para contar o tempo ativo
+                t = 0.0
+                if events is not None:
+                    events.append((ACTIVE, tag[i]))
+            elif st == ACTIVE and t >= active_ms[i]:
+                st = EXPIRED
+                if events is not None:
+                    events.append((EXPIRED, tag[i]))
+            if st > ACTIVE:
+                continue
+            if w != i:
+                x[w] = x[i]
+                y[w] = y[i]
+                warning_ms[w] = warning_ms[i]
+                active_ms[w] = active_ms[i]
+                tag[w] = tag[i]
+            state[w] = st
+            timer[w] = t
+            w += 1
+        self.count = w
+
+    def hit_test(self, px, py):
+        """
+        Marca como clicados todos os alvos ativos que contêm o ponto (px, py).
+        Retorna quantos foram acertados.
+        """
+        x, y, state = self.x, self.y, self.state
+        # mesma regra de pygame.Rect.collidepoint: borda direita/inferior exclusiva
+        x0 = px - self.w
+        y0 = py - self.h
+        hits = 0
+        for i in range(self.count):
+            if state[i] == ACTIVE and x0 < x[i] <= px and y0 < y[i] <= py:
+                state[i] = GONE
+                hits += 1
+                if self.events is not None:
+                    self.events.append((GONE, self.tag[i]))
+        return hits
+
+    def active_centers(self):
+        """
+        Centros dos alvos clicáveis (útil para jogadores simulados).
+        """
+        hw, hh = self.w // 2, self.h // 2
+        x, y, state = self.x, self.y, self.state
+        return [(x[i] + hw, y[i] + hh) for i in range(self.count) if state[i] == ACTIVE]
+
+    def clear(self):
+        self.count = 0
@@ -0,0 +1,193 @@
+# telemetry.py
+"""
+Telemetria por alvo de cada partida: quando apareceu (sombra), quando
+ficou clicável, quando foi clicado ou expirou. Serve para análise de
+jogadores e para achar tempos de reação impossíveis. Uso:
+  python -m code.telemetry                    # uma linha por partida
+  python -m code.telemetry --player ANA --suspicious-ms 120
+
+Durante a partida os dados ficam em arrays tipados (MatchTelemetry); no
+fim viram um único BLOB compacto por partida, gravado na tabela
+match_telemetry (score_id -> data) na mesma transação do score.
+
+Formato do BLOB: cabeçalho <4sBII (magic "SOLT", versão, nº de alvos,
+nº de cliques errados) seguido de colunas little-endian comprimidas com zlib:
+  spawn_ms     uint32  instante do spawn (ms de partida)
+  activate_dt  uint16  ms do spawn até ficar clicável (NONE16 = não chegou)
+  end_dt       uint16  ms da ativação até o clique/expiração (NONE16 = não acabou)
+  outcome      uint8   HIT, EXPIRED ou OPEN (vivo no fim da partida)
+  miss_ms      uint32  instante de cada clique que não acertou nada
+"""
+import argparse
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+
+from code.settings import DB_FILE
+from code.score_manager import ensure_schema
+
+MAGIC = b"SOLT"
+VERSION = 1
+_HEADER = struct.Struct("<4sBII")
+
+HIT = 0
+EXPIRED = 1
+OPEN = 2
+
+NONE16 = 0xFFFF
+
+
+def _le(values):
+    """
+    Bytes little-endian de um array (o formato gravado independe da máquina).
+    """
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class MatchTelemetry:
+    """
+    Coletor usado pela Simulation (um por partida). Cada alvo recebe um tag
+    (índice nas colunas) no spawn; os demais eventos o atualizam. Tudo em
+    ms de partida (play_time), não em relógio de parede.
+    """
+
+    def __init__(self):
+        self.spawn_ms = array("I")
+        self.activate_dt = array("H")
+        self.end_dt = array("H")
+        self.outcome = array("B")
+        self.miss_ms = array("I")
+
+    def __len__(self):
+        return len(self.spawn_ms)
+
+    def spawned(self, now_ms):
+        self.spawn_ms.append(int(now_ms))
+        self.activate_dt.append(NONE16)
+        self.end_dt.append(NONE16)
+        self.outcome.append(OPEN)
+        return len(self.spawn_ms) - 1
+
+    def activated(self, tag, now_ms):
+        self.activate_dt[tag] = min(NONE16 - 1, max(0, int(now_ms) - self.spawn_ms[tag]))
+
+    def ended(self, tag, now_ms, outcome):
+        active_at = self.spawn_ms[tag] + self.activate_dt[tag]
+        self.end_dt[tag] = min(NONE16 - 1, max(0, int(now_ms) - active_at))
+        self.outcome[tag] = outcome
+
+    def missed(self, now_ms):
+        self.miss_ms.append(int(now_ms))
+
+    def pack(self):
+        """
+        BLOB da partida (ver o formato no topo do módulo).
+        """
+        body = b"".join((_le(self.spawn_ms), _le(self.activate_dt), _le(self.end_dt),
+                         self.outcome.tobytes(), _le(self.miss_ms)))
+        return _HEADER.pack(MAGIC, VERSION, len(self.spawn_ms), len(self.miss_ms)) + zlib.compress(body, 6)
+
+
+def decode(blob):
+    """
+    BLOB -> dict de arrays: spawn_ms, activate_dt, end_dt, outcome, miss_ms.
+    ValueError se o BLOB não for de telemetria (ou for de outra versão).
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("telemetria truncada")
+    magic, version, targets, misses = _HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"telemetria desconhecida: {magic!r} v{version}")
+    body = zlib.decompress(blob[_HEADER.size:])
+    columns = {}
+    offset = 0
+    for name, typecode, n in (("spawn_ms", "I", targets), ("activate_dt", "H", targets),
+                              ("end_dt", "H", targets), ("outcome", "B", targets),
+                              ("miss_ms", "I", misses)):
+        values = array(typecode)
+        size = values.itemsize * n
+        values.frombytes(body[offset:offset + size])
+        if len(values) != n:
+            raise ValueError("telemetria truncada")
+        if sys.byteorder == "big":
+            values.byteswap()
+        columns[name] = values
+        offset += size
+    return columns
+
+
+def reaction_times(columns):
+    """
+    Tempos de reação (ms, ativação -> clique) dos alvos acertados.
+    """
+    return [dt for dt, outcome in zip(columns["end_dt"], columns["outcome"]) if outcome == HIT]
+
+
+def iter_matches(db_path=DB_FILE, player_name=None, after_id=0, fetch_size=256):
+    """
+    Gera (score_id, player_name, points, play_time_seconds, colunas) das
+    partidas com telemetria, em ordem de id. Lê do cursor em blocos de
+    fetch_size linhas e decodifica uma partida por vez: a memória não
+    cresce com o tamanho do banco.
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        ensure_schema(conn)
+        sql = """
+            SELECT s.id, s.player_name, s.points, s.play_time_seconds, t.data
+            FROM match_telemetry t JOIN scores s ON s.id = t.score_id
+            WHERE t.score_id > ?
+        """
+        params = [after_id]
+        if player_name is not None:
+            sql += " AND s.player_name = ?"
+            params.append(player_name)
+        cursor = conn.execute(sql + " ORDER BY t.score_id", params)
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for score_id, name, points, play_time_seconds, data in rows:
+                yield score_id, name, points, play_time_seconds, decode(data)
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lê a telemetria por alvo das partidas")
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--player", default=None)
+    parser.add_argument("--after", type=int, default=0, help="só partidas com score id maior")
+    parser.add_argument("--suspicious-ms", type=float, default=120.0,
+                        help="marca partidas com reação mediana abaixo disso")
+    args = parser.parse_args(argv)
+
+    matches = flagged = 0
+    try:
+        for score_id, name, points, play_time, columns in iter_matches(args.db, args.player, args.after):
+            reactions = sorted(reaction_times(columns))
+            expired = sum(1 for o in columns["outcome"] if o == EXPIRED)
+            line = (f"#{score_id} {name}: {points} pts em {play_time:.1f}s | alvos {len(columns['spawn_ms'])} "
+                    f"acertos {len(reactions)} expirados {expired} erros {len(columns['miss_ms'])}")
+            if reactions:
+                p50 = reactions[len(reactions) // 2]
+                line += f" | reação p50 {p50} ms, min {reactions[0]} ms"
+                if p50 < args.suspicious_ms:
+                    line += "  << suspeita"
+                    flagged += 1
+            print(line)
+            matches += 1
+    except (sqlite3.Error, ValueError, zlib.error) as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 1
+    print(f"{matches} partidas, {flagged} suspeitas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# text_cache.py
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    Cache de textos já renderizados, com chave (font, texto, antialias, cor).
+    Um quadro em que nenhum label mudou não rasteriza nada: todos os
+    render() viram consultas ao dicionário. Remoção LRU limitada por número
+    de entradas e por bytes.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # chave -> surface
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias=True, color=(255, 255, 255)):
+        """
+        Equivalente a font.render(text, antialias, color), mas reaproveita a surface.
+        As surfaces retornadas são compartilhadas: não devem ser modificadas.
+        """
+        key = (font, text, antialias, tuple(color))
+        surf = self._entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._entries[key] = surf
+        self._bytes += self._surface_bytes(surf)
+        while (len(self._entries) > self.max_entries or self._bytes > self.max_bytes) and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= self._surface_bytes(old)
+            self.evictions += 1
+        return surf
+
+    @staticmethod
+    def _surface_bytes(surf):
+        w, h = surf.get_size()
+        return w * h * surf.get_bytesize()
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate(), 3),
+        }
+
+
+# instância única usada pelo HUD, botões e telas de score/resultado
+text_cache = TextCache()
@@ -1,6 +1,8 @@
 # ui.py
 import pygame
 
+from code.text_cache import text_cache
+
 class Button:
     """
     Botão simples com retângulo, texto e callback.
@@ -12,6 +14,7 @@ class Button:
         self.font = font
         self.callback = callback
         self.hover = False
+        self.dirty = True  # precisa ser redesenhado (hover mudou)
 
     def draw(self, surface):
         color = (200, 200, 200) if self.hover else (160, 160, 160)
@@ -19,13 +22,23 @@ class Button:
         # borda
         pygame.draw.rect(surface, (80, 80, 80), self.rect, 2, border_radius=6)
         # texto
-        txt = self.font.render(self.text, True, (10, 10, 10))
+        txt = text_cache.render(self.font, self.text, True, (10, 10, 10))
         txt_rect = txt.get_rect(center=self.rect.center)
         surface.blit(txt, txt_rect)
+        self.dirty = False
+        return self.rect
 
     def handle_event(self, event):
+        """
+        Retorna True se o callback foi chamado.
+        """
         if event.type == pygame.MOUSEMOTION:
-            self.hover = self.rect.collidepoint(event.pos)
+            hover = self.rect.collidepoint(event.pos)
+            if hover != self.hover:
+                self.hover = hover
+                self.dirty = True
         elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
             if self.rect.collidepoint(event.pos):
                 self.callback()
+                return True
+        return False
@@ -1,21 +1,64 @@
 # main.py
+import time
+
+_T0 = time.perf_counter()  # antes de importar pygame: conta o import na abertura
+
+import argparse
 import pygame
 import code.settings as settings
-from code.menu import Menu
 
-def main():
-    pygame.init()
-    pygame.mixer.init()
-    screen = pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Speed Of Light")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="reproduz uma partida gravada (.solr)")
+    parser.add_argument("--fast", action="store_true", help="com --replay: sem display e sem limite de velocidade")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="mede o tempo até o primeiro quadro do menu e sai")
+    args = parser.parse_args(argv)
+
+    if args.replay and args.fast:
+        from code.replay import MatchLog, replay_headless
+        state = replay_headless(MatchLog.load(args.replay))
+        print(f"score={state.score} hits={state.hits} misses={state.misses} "
+              f"spawned={state.spawned} play_time={state.play_time:.3f}s")
+        return
+
+    # só display e fontes; o mixer abre quando o primeiro som for tocado (code/audio.py),
+    # mas já com buffer pequeno mesmo se outro código chamar mixer.init()
+    t_imports = time.perf_counter()
+    pygame.mixer.pre_init(settings.AUDIO_FREQUENCY, -16, 2, settings.AUDIO_BUFFER)
+    pygame.display.init()
+    pygame.font.init()
+    if settings.VSYNC:
+        # vsync no pygame 2 só é suportado junto com SCALED/OPENGL
+        screen = pygame.display.set_mode((settings.WIDTH, settings.HEIGHT), pygame.SCALED, vsync=1)
+    else:
+        screen = pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
     pygame.display.set_caption("Speed Of Light")
     clock = pygame.time.Clock()
+    t_display = time.perf_counter()
 
-    menu = Menu(screen, clock)
+    from code.score_manager import close_score_manager
     try:
-        menu.loop()
+        if args.replay:
+            from code.replay import MatchLog
+            from code.game import Game
+            Game(screen, clock).replay(MatchLog.load(args.replay))
+            return
+        from code.menu import Menu
+        menu = Menu(screen, clock)
+        t_menu = time.perf_counter()
+        menu.loop(first_frame_only=args.startup_time)
+        if args.startup_time:
+            ms = lambda a, b: (b - a) * 1000.0
+            print(f"imports={ms(_T0, t_imports):.1f}ms display={ms(t_imports, t_display):.1f}ms "
+                  f"menu={ms(t_display, t_menu):.1f}ms first_frame={ms(t_menu, menu.first_frame_at):.1f}ms "
+                  f"total={ms(_T0, menu.first_frame_at):.1f}ms")
     except SystemExit:
         pass
     finally:
+        # grava scores ainda na fila antes de sair
+        close_score_manager()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+# test_score_io.py
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from code.score_io import import_scores
+
+
+class ImportScoresTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "scores.db")
+        self.path = os.path.join(self.tmp.name, "scores.jsonl")
+        with open(self.path, "w", encoding="utf-8") as f:
+            for i in range(5):
+                f.write(json.dumps({"player_name": f"P{i % 2}", "points": 10 * i,
+                                    "play_time_seconds": 30.0 + i,
+                                    "created_at": f"2024-01-01T00:00:0{i}"}) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_import_twice_counts_rows_not_trigger_writes(self):
+        first = import_scores(self.db, self.path)
+        self.assertEqual((first["read"], first["inserted"], first["duplicates"]), (5, 5, 0))
+
+        second = import_scores(self.db, self.path)
+        self.assertEqual((second["read"], second["inserted"], second["duplicates"]), (5, 0, 5))
+
+        conn = sqlite3.connect(self.db)
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0], 5)
+            self.assertEqual(conn.execute("SELECT SUM(matches) FROM player_stats").fetchone()[0], 5)
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# test_score_manager.py
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from code.score_manager import ScoreManager, ensure_schema, _MIGRATIONS
+
+
+class _CommitBeforeTopRead:
+    """
+    Conexão de leitura que, antes do primeiro SELECT do top N, grava um
+    score por outra conexão (como a thread de escrita commitando no meio).
+    """
+
+    def __init__(self, conn, db_path, row):
+        self._conn = conn
+        self._db_path = db_path
+        self._row = row
+        self.inserted_id = None
+
+    def execute(self, sql, params=()):
+        if self.inserted_id is None and "ORDER BY" in sql:
+            other = sqlite3.connect(self._db_path)
+            with other:
+                self.inserted_id = other.execute(
+                    "INSERT INTO scores (player_name, points, play_time_seconds, created_at) VALUES (?, ?, ?, ?)",
+                    self._row).lastrowid
+            other.close()
+        return self._conn.execute(sql, params)
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+class TopCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "scores.db")
+        self.manager = ScoreManager(self.db, top_cache_size=10)
+        for i in range(5):
+            self.manager.add_score(f"P{i}", 10 * i, 30.0, created_at=f"2024-01-01T00:00:0{i}")
+        self.assertTrue(self.manager.flush(5))
+
+    def tearDown(self):
+        self.manager.close()
+        self.tmp.cleanup()
+
+    def test_commit_between_max_id_and_top_rows_is_cached_once(self):
+        manager = self.manager
+        row = ("winner", 999, 50.0, "2024-01-02T00:00:00")
+        proxy = _CommitBeforeTopRead(manager._conn, self.db, row)
+        manager._conn = proxy
+        manager.top_scores(3)  # carrega o cache; o score novo é commitado no meio
+        self.assertIsNotNone(proxy.inserted_id)
+        # a thread de escrita atualiza o cache depois do commit
+        manager._cache_insert([row], [proxy.inserted_id])
+
+        top = manager.top_scores(3)
+        self.assertEqual([r[0] for r in top].count("winner"), 1)
+        self.assertEqual(len(manager._top_keys), len(set(manager._top_keys)))
+
+
+class ReadWithPendingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "scores.db")
+        self.manager = ScoreManager(self.db)
+
+    def tearDown(self):
+        self.manager.close()
+        self.tmp.cleanup()
+
+    def test_summary_does_not_wait_for_a_blocked_writer(self):
+        manager = self.manager
+        manager.add_score("me", 10, 30.0)
+        self.assertTrue(manager.flush(5))
+
+        # outro processo segurando a escrita: a thread de escrita fica esperando o lock
+        other = sqlite3.connect(self.db, check_same_thread=False)
+        other.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(2.0, other.rollback)
+        release.start()
+        try:
+            manager.add_score("me", 30, 31.0)
+            time.sleep(0.2)  # a thread de escrita já entrou no lote
+            t0 = time.perf_counter()
+            summary = manager.player_summary("me")
+            rank = manager.rank_for(20, 30.0)
+            elapsed = time.perf_counter() - t0
+        finally:
+            release.join()
+            other.close()
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(summary, {"matches": 2, "best": 30, "average": 20.0})
+        self.assertEqual(rank, (2, 3))
+        self.assertTrue(manager.flush(5))
+        self.assertEqual(manager.player_summary("me")["matches"], 2)
+
+
+class ConcurrentMigrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "scores.db")
+        # banco na versão 2 (antes dos resumos materializados), com scores
+        conn = sqlite3.connect(self.db)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE scores (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_name TEXT NOT NULL,
+                points INTEGER NOT NULL,
+                play_time_seconds REAL NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+        for sql in _MIGRATIONS[:2]:
+            conn.execute(sql)
+        conn.execute("PRAGMA user_version = 2")
+        with conn:
+            conn.executemany(
+                "INSERT INTO scores (player_name, points, play_time_seconds, created_at) VALUES (?, ?, ?, ?)",
+                [(f"P{i % 3}", 10 * i, 30.0, f"2024-01-01T00:00:{i:02d}") for i in range(20)])
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_two_connections_migrate_a_legacy_db_at_once(self):
+        # uma terceira conexão segura a escrita até as duas terem lido a versão 2
+        blocker = sqlite3.connect(self.db, check_same_thread=False)
+        blocker.execute("BEGIN IMMEDIATE")
+        errors = []
+
+        def migrate():
+            conn = sqlite3.connect(self.db, timeout=30)
+            try:
+                ensure_schema(conn)
+            except sqlite3.Error as e:
+                errors.append(e)
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=migrate) for _ in range(2)]
+        for t in threads:
+            t.start()
+        time.sleep(0.3)
+        blocker.rollback()
+        blocker.close()
+        for t in threads:
+            t.join(30)
+
+        self.assertEqual(errors, [])
+        conn = sqlite3.connect(self.db)
+        try:
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], len(_MIGRATIONS))
+            self.assertEqual(conn.execute("SELECT SUM(matches) FROM player_stats").fetchone()[0], 20)
+            self.assertEqual(conn.execute("SELECT SUM(n) FROM score_counts").fetchone()[0], 20)
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()